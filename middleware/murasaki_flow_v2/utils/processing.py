@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 import json
 import os
@@ -30,14 +31,12 @@ def load_rules(spec: Any) -> List[Dict[str, Any]]:
         return []
 
 
-def load_glossary(spec: Any) -> Dict[str, str]:
-    if not spec:
-        return {}
-    if isinstance(spec, dict):
-        return {str(k): str(v) for k, v in spec.items() if k and v}
-    if isinstance(spec, list):
+def _glossary_from_data(data: Any) -> Dict[str, str]:
+    if isinstance(data, dict):
+        return {str(k): str(v) for k, v in data.items() if k and v}
+    if isinstance(data, list):
         glossary: Dict[str, str] = {}
-        for entry in spec:
+        for entry in data:
             if not isinstance(entry, dict):
                 continue
             src = entry.get("src") or entry.get("jp") or entry.get("original")
@@ -45,44 +44,42 @@ def load_glossary(spec: Any) -> Dict[str, str]:
             if src and dst:
                 glossary[str(src)] = str(dst)
         return glossary
+    return {}
+
+
+@lru_cache(maxsize=32)
+def _load_glossary_file(
+    path: str, mtime_ns: int, size: int
+) -> Tuple[Tuple[str, str], ...]:
+    # mtime/size are part of the cache key so an edited file is re-parsed.
+    try:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            data = json.loads(f.read())
+    except Exception:
+        return ()
+    return tuple(_glossary_from_data(data).items())
+
+
+def load_glossary(spec: Any) -> Dict[str, str]:
+    if not spec:
+        return {}
+    if isinstance(spec, (dict, list)):
+        return _glossary_from_data(spec)
     if not isinstance(spec, str):
         return {}
-    if os.path.exists(spec) and spec.lower().endswith(".json"):
+    if spec.lower().endswith(".json") and os.path.exists(spec):
         try:
-            with open(spec, "r", encoding="utf-8-sig") as f:
-                data = json.load(f)
-            if isinstance(data, dict):
-                return {str(k): str(v) for k, v in data.items() if k and v}
-            if isinstance(data, list):
-                glossary: Dict[str, str] = {}
-                for entry in data:
-                    if not isinstance(entry, dict):
-                        continue
-                    src = entry.get("src") or entry.get("jp") or entry.get("original")
-                    dst = entry.get("dst") or entry.get("zh") or entry.get("translation")
-                    if src and dst:
-                        glossary[str(src)] = str(dst)
-                return glossary
-        except Exception:
+            stat = os.stat(spec)
+        except OSError:
             return {}
-        return {}
+        return dict(
+            _load_glossary_file(os.path.abspath(spec), stat.st_mtime_ns, stat.st_size)
+        )
     try:
         data = json.loads(spec)
     except json.JSONDecodeError:
         return {}
-    if isinstance(data, dict):
-        return {str(k): str(v) for k, v in data.items() if k and v}
-    if isinstance(data, list):
-        glossary: Dict[str, str] = {}
-        for entry in data:
-            if not isinstance(entry, dict):
-                continue
-            src = entry.get("src") or entry.get("jp") or entry.get("original")
-            dst = entry.get("dst") or entry.get("zh") or entry.get("translation")
-            if src and dst:
-                glossary[str(src)] = str(dst)
-        return glossary
-    return {}
+    return _glossary_from_data(data)
 
 
 def _parse_protect_pattern_lines(lines: List[str]) -> Tuple[List[str], List[str]]:
@@ -10,6 +10,21 @@ import threading  # [修复] 并发安全
 from typing import List, Dict, Optional
 from dataclasses import dataclass, field
 
+try:
+    import orjson  # 可选依赖：C 实现的缩进编码（json.dumps 带 indent 时走纯 Python 编码器）
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def _encode_cache(data: Dict) -> bytes:
+    """把缓存数据编码为缩进 2 空格的 UTF-8 JSON；orjson 不可用或无法编码时退回标准库"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:  # orjson.JSONEncodeError 是 TypeError 的子类（如孤立代理字符）
+            pass
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
 
 @dataclass
 class CacheBlock:
@@ -28,15 +43,20 @@ class CacheBlock:
         if self.retry_history is None:
             self.retry_history = []
     
+    @staticmethod
+    def _count_lines(text: str) -> int:
+        """非空白行数（isspace 与 strip 判定一致，不为每行分配副本）"""
+        return sum(1 for l in text.split('\n') if l and not l.isspace())
+
     @property
     def src_lines(self) -> int:
         """原文行数"""
-        return len([l for l in self.src.split('\n') if l.strip()])
+        return self._count_lines(self.src)
     
     @property
     def dst_lines(self) -> int:
         """译文行数"""
-        return len([l for l in self.dst.split('\n') if l.strip()])
+        return self._count_lines(self.dst)
     
     @property
     def src_chars(self) -> int:
@@ -137,9 +157,10 @@ class TranslationCache:
         try:
             # [并发安全] 加锁保护读取和保存操作
             with self._lock:
-                # 计算统计信息
-                total_src_lines = sum(b.src_lines for b in self.blocks)
-                total_dst_lines = sum(b.dst_lines for b in self.blocks)
+                # 每个 block 只序列化一次，统计信息直接取自序列化结果（行数不再重复计算）
+                block_dicts = [block.to_dict() for block in self.blocks]
+                total_src_lines = sum(d['srcLines'] for d in block_dicts)
+                total_dst_lines = sum(d['dstLines'] for d in block_dicts)
                 total_src_chars = sum(b.src_chars for b in self.blocks)
                 total_dst_chars = sum(b.dst_chars for b in self.blocks)
 
@@ -157,7 +178,7 @@ class TranslationCache:
                         'srcChars': total_src_chars,
                         'dstChars': total_dst_chars
                     },
-                    'blocks': [block.to_dict() for block in self.blocks]
+                    'blocks': block_dicts
                 }
                 normalized_engine_mode = str(engine_mode or '').strip().lower()
                 if normalized_engine_mode in {'v1', 'v2'}:
@@ -170,9 +191,11 @@ class TranslationCache:
                 normalized_pipeline_id = str(pipeline_id or '').strip()
                 if normalized_pipeline_id:
                     data['pipelineId'] = normalized_pipeline_id
-            # 在锁外进行文件 I/O，避免阻塞其他线程
-            with open(self.cache_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # 在锁外进行编码与文件 I/O，避免阻塞其他线程
+            # 先整体编码为 UTF-8 字节再一次写入：json.dump 会把每个小片段各写一次
+            payload = _encode_cache(data)
+            with open(self.cache_path, 'wb') as f:
+                f.write(payload)
             return True
         except Exception as e:
             print(f"[Cache] Failed to save: {e}")
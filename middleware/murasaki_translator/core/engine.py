@@ -6,12 +6,22 @@ import json
 import logging
 import subprocess
 import requests
+from requests.adapters import HTTPAdapter
 import atexit
 import threading
 from typing import List, Dict, Optional, Callable
 
 logger = logging.getLogger(__name__)
 
+# Repetition guard constants (hoisted: the guard runs once per streamed token)
+# Whitelist for stylistic repetition (Light Novel style)
+# Allow: Ellipsis, Dash, Tilde, Exclamation, Spaces, 'Ah', 'Ugh', etc.
+_SAFE_LOOP_CHARS = frozenset({'…', '—', '─', '~', '～', '！', '!', '？', '?', '.', '。', ' ', '\n', '　', '啊', 'ー', '”', '’'})
+# 装饰性符号白名单（作者常用的分隔符）
+_DECORATIVE_CHARS = frozenset('*=-_~·•◆◇■□▲△▼▽○●★☆♪♫♡♥✦✧※→←↑↓ \n\t　')
+# Full coverage: step 10 (20-500) + step 50 (500-1000) = ~58 checks
+_LOOP_SAMPLE_LENGTHS = tuple(range(20, 500, 10)) + tuple(range(500, 1001, 50))
+
 
 class NonRetryableStreamProtocolError(RuntimeError):
     """Streaming endpoint returned a protocol-level invalid payload."""
@@ -51,7 +61,13 @@ class InferenceEngine:
         self.last_usage = None
         self.base_url = f"http://{host}:{port}"
         self.session = requests.Session()
+        # 所有并发 worker 共享同一个 Session：连接池需容纳全部 --parallel 槽位，
+        # 否则并发超过 requests 默认的 10 个连接时，多余连接用完即丢，每个块都要重新建连
+        pool_size = max(10, int(n_parallel or 1))
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
         self.process = None
+        # 由 cancel_start() 置位：启动线程不再拉起 llama-server，等待就绪的循环也随之退出
+        self._start_cancelled = threading.Event()
         
         # Real-time stats counters (Atomic-like usage in GIL)
         self.generated_chars_count = 0
@@ -131,17 +147,30 @@ class InferenceEngine:
         
         logger.info(f"[GPU Config] n_gpu_layers={self.n_gpu_layers} (0=CPU only, -1=All layers to GPU)")
         
+        if self._start_cancelled.is_set():
+            raise RuntimeError("Server start cancelled")
+
         # 将输出重定向到 server.log，保持 GUI 日志清洁
         self.server_log = open("server.log", "w", encoding='utf-8')
         self.process = subprocess.Popen(cmd, stdout=self.server_log, stderr=self.server_log) 
 
         atexit.register(self.stop_server)
         self._wait_for_ready()
+
+    def cancel_start(self):
+        """
+        取消仍在进行中的 start_server()（通常在后台线程中执行）：
+        尚未拉起的进程不再启动，已在等待就绪的循环尽快退出。已启动的进程仍需 stop_server() 结束。
+        """
+        self._start_cancelled.set()
         
     def _wait_for_ready(self, timeout=180):
         logger.info("Waiting for server to be ready...")
         start = time.time()
         while time.time() - start < timeout:
+            if self._start_cancelled.is_set():
+                raise RuntimeError("Server start cancelled")
+
             # Failsafe: Check if process died (guard for no_spawn mode where self.process is None)
             if self.process and self.process.poll() is not None:
                 logger.error(f"Server process terminated unexpectedly with code {self.process.returncode}")
@@ -274,6 +303,9 @@ class InferenceEngine:
                 "repetition_penalty": penalty,
                 "presence_penalty": 0.0,
                 "frequency_penalty": 0.0,
+                # 各块的 system prompt 前缀（预设文本）相同，显式要求复用槽位中已计算的 KV，
+                # 只需重新 prefill 术语表与正文部分（旧版 llama-server 默认不开启）
+                "cache_prompt": True,
                 # Comprehensive Stop Tokens for Llama3, Qwen, Mistral, ChatML
                 "stop": [
                     "<|im_end|>",       # ChatML
@@ -318,7 +350,8 @@ class InferenceEngine:
                             f"Invalid stream response content-type: {content_type or '<unknown>'}"
                         )
                 
-                full_reasoning = ""
+                # Reasoning is only needed once the stream ends: collect parts, join once
+                reasoning_parts = []
                 full_text = ""
                 loop_detected = False
                 
@@ -326,18 +359,22 @@ class InferenceEngine:
                     saw_data_chunk = False
                     unexpected_preview = ""
                     
+                    # SSE 帧保持 bytes：前缀判断与 json.loads 直接作用于原始字节，不再逐帧先解码成 str
                     for line in response.iter_lines():
                         if not line: continue
-                        line = line.decode('utf-8', errors='ignore')
-                        if not line.startswith('data: '):
+                        if not line.startswith(b'data: '):
                             if not unexpected_preview:
-                                unexpected_preview = line[:160]
+                                unexpected_preview = line.decode('utf-8', errors='ignore')[:160]
                             continue
                         saw_data_chunk = True
                         data = line[6:]
-                        if data == '[DONE]': break
+                        if data == b'[DONE]': break
                         try:
-                            chunk = json.loads(data)
+                            try:
+                                chunk = json.loads(data)
+                            except UnicodeDecodeError:
+                                # 非法 UTF-8 字节按旧行为忽略后再解析
+                                chunk = json.loads(data.decode('utf-8', errors='ignore'))
                             
                             if 'usage' in chunk:
                                 local_last_usage = chunk['usage']
@@ -351,7 +388,7 @@ class InferenceEngine:
                             content = delta.get('content', '')
                             
                             if reasoning:
-                                full_reasoning += reasoning
+                                reasoning_parts.append(reasoning)
                                 # Count reasoning tokens (fallback)
                                 if local_last_usage is None:
                                     local_token_count += 1
@@ -371,30 +408,26 @@ class InferenceEngine:
                                 # Repetition Guard
                                 if len(full_text) > 20:
                                     last_char = full_text[-1]
-                                    # Whitelist for stylistic repetition (Light Novel style)
-                                    # Allow: Ellipsis, Dash, Tilde, Exclamation, Spaces, 'Ah', 'Ugh', etc.
-                                    SAFE_LOOP_CHARS = {'…', '—', '─', '~', '～', '！', '!', '？', '?', '.', '。', ' ', '\n', '　', '啊', 'ー', '”', '’'}
                                     
                                     # Dynamic threshold
                                     loop_threshold = 40
-                                    if last_char in SAFE_LOOP_CHARS:
+                                    if last_char in _SAFE_LOOP_CHARS:
                                         loop_threshold = 80  # Allow much longer stylistic loops
                                     
                                     # 1. Single Char Loop (e.g. ".......")
-                                    if len(full_text) >= loop_threshold and full_text[-loop_threshold:] == last_char * loop_threshold:
+                                    # Quick exit on the window's first char before building the comparison string
+                                    if (len(full_text) >= loop_threshold
+                                            and full_text[-loop_threshold] == last_char
+                                            and full_text[-loop_threshold:] == last_char * loop_threshold):
                                         logger.warning(f"Detected char loop on '{last_char}' (Limit={loop_threshold}). Aborting.")
                                         loop_detected = True
                                     
                                     # 2. Phrase Loop (e.g. "output... output...")
                                     # Optimized: Sample specific lengths instead of O(n) scan
                                     if not loop_detected and len(full_text) > 60:
-                                        # Full coverage: step 10 (20-500) + step 50 (500-1000) = ~58 checks
-                                        sample_lengths = list(range(20, 500, 10)) + list(range(500, 1001, 50))
                                         max_check = len(full_text) // 2
-                                        # 装饰性符号白名单（作者常用的分隔符）
-                                        DECORATIVE_CHARS = set('*=-_~·•◆◇■□▲△▼▽○●★☆♪♫♡♥✦✧※→←↑↓ \n\t　')
                                         
-                                        for length in sample_lengths:
+                                        for length in _LOOP_SAMPLE_LENGTHS:
                                             if length > max_check:
                                                 break
                                             # Quick exit: last char mismatch means no match
@@ -404,7 +437,7 @@ class InferenceEngine:
                                             if full_text[-length:] == full_text[-2*length:-length]:
                                                 repeated_phrase = full_text[-length:]
                                                 # 如果重复片段只包含装饰性符号，则不拦截
-                                                if all(c in DECORATIVE_CHARS for c in repeated_phrase):
+                                                if all(c in _DECORATIVE_CHARS for c in repeated_phrase):
                                                     continue  # Skip decorative patterns like "***", "===", etc.
                                                 # 截取重复内容前50字符用于日志（避免过长）
                                                 preview = repeated_phrase[:50].replace('\n', '\\n')
@@ -465,6 +498,7 @@ class InferenceEngine:
                     
                     # Success or Final Fail -> Return Result
                     final_text = full_text
+                    full_reasoning = "".join(reasoning_parts)
                     if full_reasoning:
                         final_text = f"<think>{full_reasoning}</think>\n{full_text}"
                     
@@ -7,6 +7,54 @@ from typing import List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# 思考块正则在模块级编译一次，所有 ResponseParser 实例共享
+_THINK_OPEN = "<think>"
+_THINK_CLOSE = "</think>"
+_THINK_CLOSED_RE = re.compile(r'<think>.*?</think>', re.DOTALL)
+# Support unclosed tags (for streaming or cut-off outputs)
+_THINK_OPEN_RE = re.compile(r'<think>(.*?)(?:</think>|$)', re.DOTALL)
+_LINE_STRICT_RE = re.compile(r'^\[(\d+)\]\s*(.*)')
+_OPEN_LEN = len(_THINK_OPEN)
+_CLOSE_LEN = len(_THINK_CLOSE)
+
+
+def _find_closed_think(text: str, pos: int = 0) -> Tuple[int, int]:
+    """
+    等价于 _THINK_CLOSED_RE.search(text, pos)：返回首个闭合思考块的 [start, end)，无则 (-1, -1)。
+    首个 <think> 之后没有 </think> 时，更靠后的 <think> 也不可能闭合。
+    """
+    start = text.find(_THINK_OPEN, pos)
+    if start == -1:
+        return -1, -1
+    close = text.find(_THINK_CLOSE, start + _OPEN_LEN)
+    if close == -1:
+        return -1, -1
+    return start, close + _CLOSE_LEN
+
+
+def _remove_closed_think(text: str) -> str:
+    """等价于 _THINK_CLOSED_RE.sub('', text)，用 str.find 逐段拼接"""
+    parts = []
+    pos = 0
+    while True:
+        start, end = _find_closed_think(text, pos)
+        if start == -1:
+            break
+        parts.append(text[pos:start])
+        pos = end
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def _open_think_end(text: str) -> int:
+    """
+    未闭合时 _THINK_OPEN_RE 的匹配终点：非 MULTILINE 的 $ 最早匹配于末尾换行之前。
+    调用前须确认文本中不存在闭合思考块。
+    """
+    return len(text) - 1 if text.endswith('\n') else len(text)
+
 class ResponseParser:
     """
     解析器：处理 CoT 去除和行号对齐校验
@@ -16,12 +64,11 @@ class ResponseParser:
     3. 纯文本格式
     """
     def __init__(self):
-        self.think_pattern = re.compile(r'<think>.*?</think>', re.DOTALL)
+        self.think_pattern = _THINK_CLOSED_RE
         # 兼容 [1] xxx, [01] xxx, 1. xxx 等多种格式
-        self.line_pattern_strict = re.compile(r'^\[(\d+)\]\s*(.*)')
-        # Support unclosed tags (for streaming or cut-off outputs)
-        self.think_pattern_open = re.compile(r'<think>(.*?)(?:</think>|$)', re.DOTALL)
-        self.think_pattern_closed = re.compile(r'<think>.*?</think>', re.DOTALL)
+        self.line_pattern_strict = _LINE_STRICT_RE
+        self.think_pattern_open = _THINK_OPEN_RE
+        self.think_pattern_closed = _THINK_CLOSED_RE
         
     def parse(self, raw_output: str, expected_count: int = 0) -> Tuple[List[str], str]:
         """
@@ -56,26 +103,47 @@ class ResponseParser:
                 # 不是有效 JSON，按原方式处理
                 pass
         
+        if not isinstance(clean_text, str):
+            # JSON 中的译文字段不是字符串（与正则匹配时的 TypeError 一致）
+            raise TypeError(f"expected string translation, got {type(clean_text).__name__}")
+        
+        # 无 <think> 时两条正则都不可能命中，跳过 2、3 步的扫描（结果等价）
+        if _THINK_OPEN not in clean_text:
+            clean_text = clean_text.strip().replace(_THINK_CLOSE, '')
+            return self._finish(clean_text), cot_content
+        
+        # 以下用 str.find 定位字面分隔符，结果与 think_pattern_closed / think_pattern_open 一致
+        open_pos = clean_text.find(_THINK_OPEN)
+        start, end = _find_closed_think(clean_text)
+        
         # 2. 提取 <think> 标签内容 (如果还没提取到)
         if not cot_content:
             # First try to find closed tags
-            think_match = self.think_pattern_closed.search(clean_text)
-            if not think_match:
-                 # Fallback to open tags
-                 think_match = self.think_pattern_open.search(clean_text)
-            
-            cot_content = think_match.group(0) if think_match else ""
+            if start != -1:
+                cot_content = clean_text[start:end]
+            else:
+                # Fallback to open tags
+                cot_content = clean_text[open_pos:_open_think_end(clean_text)]
         
         # 3. 移除 <think> 标签得到正文
         # Use simple replacement first for safety
-        clean_text_no_think = self.think_pattern_closed.sub('', clean_text).strip()
-        if clean_text_no_think == clean_text:
-             # Try removing open tag match if closed didn't match
-             clean_text_no_think = self.think_pattern_open.sub('', clean_text).strip()
+        if start != -1:
+            clean_text_no_think = _remove_closed_think(clean_text).strip()
+        else:
+            clean_text_no_think = clean_text.strip()
+            if clean_text_no_think == clean_text:
+                # Try removing open tag match if closed didn't match
+                clean_text_no_think = (
+                    clean_text[:open_pos] + clean_text[_open_think_end(clean_text):]
+                ).strip()
         clean_text = clean_text_no_think
         # 3.1 移除可能的残留标签 (如模型幻觉产生的孤立 </think>)
-        clean_text = clean_text.replace('<think>', '').replace('</think>', '')
-        
+        clean_text = clean_text.replace(_THINK_OPEN, '').replace(_THINK_CLOSE, '')
+        return self._finish(clean_text), cot_content
+    
+    @staticmethod
+    def _finish(clean_text: str) -> List[str]:
+        """去除嵌套 JSON 包装并按行切分"""
         # 3.2 再次检查是否有 JSON 包装 (处理嵌套情况)
         clean_text = clean_text.strip()
         if clean_text.startswith('{') and clean_text.endswith('}'):
@@ -89,6 +157,5 @@ class ResponseParser:
         # 只移除每行右侧的空格，但保留空行本身（对SRT结构很重要）
         lines = [l.rstrip() for l in lines]
         # 注意：不要移除尾部空行！SRT/ASS 需要它们作为单元分隔符
-            
-        return lines, cot_content
+        return lines
 
@@ -4,6 +4,8 @@ import json
 import re
 from typing import List, Dict, Optional
 
+from murasaki_translator.core.quality_checker import find_relevant_terms
+
 # ============================================================
 # Prompt 预设配置 (策略模式)
 # 新增预设时只需在此字典中添加，无需修改 build_messages 逻辑
@@ -46,11 +48,7 @@ class PromptBuilder:
         检查文本中是否包含术语表中的 Key
         注意：排除单字术语，避免误匹配
         """
-        extracted = {}
-        for k, v in self.glossary.items():
-            # 排除单字术语，避免误匹配
-            if len(k) > 1 and k in text:
-                extracted[k] = v
+        extracted = find_relevant_terms(text, self.glossary)
         
         # 限制数量，防止 Prompt 过长 (Top 20)
         return dict(list(extracted.items())[:20])
@@ -22,6 +22,11 @@ class WarningType:
     EMPTY_OUTPUT = "empty_output"           # 空输出
 
 
+def _count_nonempty(lines: List[str]) -> int:
+    """统计非空白行数（isspace() 与 strip() 判定一致，不构造中间列表）"""
+    return sum(1 for l in lines if l and not l.isspace())
+
+
 class QualityChecker:
     """
     翻译质量检查器
@@ -71,21 +76,24 @@ class QualityChecker:
         warnings = []
         
         # 1. 行数检测 (忽略空行)
-        src_non_empty = [l for l in source_lines if l.strip()]
-        dst_non_empty = [l for l in output_lines if l.strip()]
-        if len(src_non_empty) != len(dst_non_empty):
+        src_non_empty = _count_nonempty(source_lines)
+        dst_non_empty = _count_nonempty(output_lines)
+        if src_non_empty != dst_non_empty:
             warnings.append({
                 "type": WarningType.LINE_MISMATCH,
                 "line": 0,
-                "message": f"行数不匹配: 原文 {len(src_non_empty)} 行, 译文 {len(dst_non_empty)} 行 (忽略空行)"
+                "message": f"行数不匹配: 原文 {src_non_empty} 行, 译文 {dst_non_empty} 行 (忽略空行)"
             })
         
+        # 术语先按整段原文筛一次，逐行检测只需遍历本段出现过的术语
+        block_glossary = self._relevant_glossary("\n".join(source_lines))
+        
         # 2. 逐行检测
         for i, (src, dst) in enumerate(zip(source_lines, output_lines)):
             line_num = i + 1
             
             # 空输出检测 (仅当原文不为空时)
-            if src.strip() and not dst.strip():
+            if src and not src.isspace() and (not dst or dst.isspace()):
                 warnings.append({
                     "type": WarningType.EMPTY_OUTPUT,
                     "line": line_num,
@@ -112,7 +120,7 @@ class QualityChecker:
                 })
             
             # 术语表检测
-            glossary_warnings = self._check_glossary(src, dst, line_num)
+            glossary_warnings = self._check_glossary(src, dst, line_num, block_glossary)
             warnings.extend(glossary_warnings)
         
         return warnings
@@ -198,8 +206,17 @@ class QualityChecker:
         
         return intersection / union if union > 0 else 0.0
     
-    def _check_glossary(self, src: str, dst: str, line_num: int) -> List[Dict[str, Any]]:
-        """检测术语表是否生效"""
+    def _relevant_glossary(self, source_text: str) -> List[Dict[str, Any]]:
+        """筛出原文中出现过的术语条目（保持原有顺序），供整段逐行检测复用"""
+        relevant = []
+        for entry in self.glossary:
+            term_src = entry.get("src", "")
+            if term_src and entry.get("dst", "") and term_src in source_text:
+                relevant.append(entry)
+        return relevant
+    
+    def _check_glossary(self, src: str, dst: str, line_num: int, entries: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """检测术语表是否生效（entries 为预筛选的术语条目，缺省时遍历整个术语表）"""
         warnings = []
         
         # DEBUG: Print if glossary is empty (once)
@@ -207,7 +224,7 @@ class QualityChecker:
 
             self._debug_logged = True
 
-        for entry in self.glossary:
+        for entry in (self.glossary if entries is None else entries):
             term_src = entry.get("src", "")
             term_dst = entry.get("dst", "")
             
@@ -264,13 +281,31 @@ def count_warnings_by_type(warnings: List[Dict[str, Any]]) -> Dict[str, int]:
     return counts
 
 
+def find_relevant_terms(source_text: str, glossary: Dict[str, str]) -> Dict[str, str]:
+    """
+    找出原文中出现的术语（排除单字术语），保持术语表原有顺序。
+
+    先用原文的相邻二字集合过滤：术语的前两个字不在集合中时不可能出现在原文里，
+    大多数术语只需一次集合查找，不必对整段原文做子串搜索。
+    """
+    if len(source_text) < 2:
+        return {}
+    bigrams = {source_text[i:i + 2] for i in range(len(source_text) - 1)}
+    return {
+        src_term: dst_term
+        for src_term, dst_term in glossary.items()
+        if len(src_term) > 1 and src_term[:2] in bigrams and src_term in source_text
+    }
+
+
 def calculate_glossary_coverage(
     source_text: str, 
     translated_text: str, 
     glossary: Dict[str, str],
     cot_text: str = "",
     output_hit_threshold: float = 60.0,
-    cot_coverage_threshold: float = 80.0
+    cot_coverage_threshold: float = 80.0,
+    relevant_terms: Optional[Dict[str, str]] = None
 ) -> Tuple[bool, float, float, int, int]:
     """
     计算术语表覆盖率（支持 CoT 检查）
@@ -286,6 +321,8 @@ def calculate_glossary_coverage(
         cot_text: 模型思考过程文本（可选）
         output_hit_threshold: 输出精确命中阈值（默认 60%）
         cot_coverage_threshold: CoT 覆盖阈值（默认 80%）
+        relevant_terms: 可选，预先计算的 find_relevant_terms(source_text, glossary)，
+                        同一原文多次重试时复用，避免重复扫描术语表
         
     Returns:
         (是否通过, 输出覆盖率, CoT覆盖率, 命中数, 应命中总数)
@@ -295,11 +332,8 @@ def calculate_glossary_coverage(
         return True, 100.0, 0.0, 0, 0
     
     # 找出原文中出现的术语
-    relevant_terms = {}
-    for src_term, dst_term in glossary.items():
-        # 排除单字术语
-        if len(src_term) > 1 and src_term in source_text:
-            relevant_terms[src_term] = dst_term
+    if relevant_terms is None:
+        relevant_terms = find_relevant_terms(source_text, glossary)
     
     if not relevant_terms:
         print(f"[Glossary Check] Skipped (No relevant terms found in {len(source_text)} chars of source text).")
@@ -5,7 +5,70 @@ Text Protector - 文本保护模块
 """
 
 import re
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Optional
+
+
+@lru_cache(maxsize=256)
+def _leading_literal(pattern: str) -> Optional[str]:
+    """
+    返回模式必须以之开头的字面字符，无法确定时返回 None。
+
+    仅识别 "单个字面字符/转义符号 + 非可选" 的简单前缀（覆盖全部内置模式），
+    用于在文本中不存在该字符时直接跳过整条模式。
+    """
+    if not pattern or "|" in pattern:
+        return None
+    first = pattern[0]
+    if first == "\\":
+        if len(pattern) < 2 or pattern[1].isalnum():
+            return None  # \d, \w, \b 等字符类/断言
+        first, rest = pattern[1], pattern[2:]
+    elif first in ".^$*+?()[|":
+        return None
+    else:
+        rest = pattern[1:]
+    # 首字符被量词修饰时可能不出现
+    if rest[:1] in ("?", "*") or re.match(r"\{\d*,?\d*\}", rest):
+        return None
+    return first
+
+
+# 数字和下划线、字母的全角转换表
+_MANGLE_TABLE = str.maketrans(
+    "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_@#!$%^&*()[]{}<>",
+    "０１２３４５６７８９ａｂｃｄｅｆｇｈｉｊｋｌｍｎｏｐｑｒｓｔｕｖｗｘｙｚＡＢＣＤＥＦＧＨＩＪＫＬＭＮＯＰＱＲＳＴＵＶＷＸＹＺ＿＠＃！＄％＾＆＊（）［］｛｝＜＞"
+)
+
+
+@lru_cache(maxsize=4096)
+def _fuzzy_placeholder_regex(placeholder: str, aggressive_cleaning: bool) -> Optional["re.Pattern[str]"]:
+    """
+    构造占位符的模糊还原正则（按占位符文本缓存，跨分块/跨文件复用编译结果）。
+
+    能匹配 @P1@, @ P 1 @, ＠Ｐ１＠, ＠　Ｐ　１　＠ 等变形：每个字符都变成 [字符|全角字符] 并允许后随空白，
+    以吞噬模型在占位符内部/之后插入的空格。编译失败时返回 None。
+    """
+    fuzzy_pattern = ""
+    last = len(placeholder) - 1
+    for i, char in enumerate(placeholder):
+        fw_char = char.translate(_MANGLE_TABLE)
+        if char == fw_char:
+            char_part = re.escape(char)
+        else:
+            char_part = f"[{re.escape(char)}{re.escape(fw_char)}]"
+
+        # If aggressive_cleaning is False (SRT/TXT), we DO NOT consume trailing spaces
+        # to preserve structural newlines or intended spaces.
+        if i == last and not aggressive_cleaning:
+            fuzzy_pattern += char_part
+        else:
+            fuzzy_pattern += char_part + r"\s*"
+
+    try:
+        return re.compile(fuzzy_pattern.strip())
+    except re.error:
+        return None
 
 
 class TextProtector:
@@ -56,6 +119,8 @@ class TextProtector:
         self.block_id = block_id
         self.aggressive_cleaning = aggressive_cleaning
         self.replacements: Dict[str, str] = {}  # 占位符 -> 原文
+        self._originals: Dict[str, str] = {}  # 原文 -> 占位符（去重用的反向索引）
+        self._scan_text = ""  # 当前正在替换的文本，用于占位符冲突检测
         self.counter = 1  # 占位符计数器 (从 1 开始)
     
     def protect(self, text: str) -> str:
@@ -67,39 +132,48 @@ class TextProtector:
         
         # 重置状态
         self.replacements = {}
+        self._originals = {}
         self.counter = 1
         
         result = text
         for pattern in self.patterns:
+            # 按首字符分派：文本中不含该字符时整条模式不可能命中
+            lead = _leading_literal(pattern)
+            if lead is not None and lead not in result:
+                continue
             try:
-                def replace_match(match):
-                    original = match.group()
-                    # 防止由于多个 Pattern 导致同一个地方被重复保护
-                    for placeholder, orig in self.replacements.items():
-                        if orig == original:
-                            return placeholder
-                    
-                    # Avoid collisions with existing system markers or original text
-                    while True:
-                        placeholder = (
-                            self.placeholder_format
-                            .replace("{block_id}", str(self.block_id))
-                            .replace("{index}", str(self.counter))
-                        )
-                        if placeholder not in result and placeholder not in self.replacements:
-                            break
-                        self.counter += 1
-
-                    self.counter += 1
-                    self.replacements[placeholder] = original
-                    return placeholder
-                
-                result = re.sub(pattern, replace_match, result)
+                self._scan_text = result
+                result = re.sub(pattern, self._replace_match, result)
             except re.error as e:
                 print(f"[TextProtector] Invalid pattern '{pattern}': {e}")
                 continue
         
+        self._scan_text = ""
         return result
+
+    def _replace_match(self, match: "re.Match[str]") -> str:
+        """re.sub 回调：为匹配文本分配（或复用）占位符"""
+        original = match.group()
+        # 防止由于多个 Pattern 导致同一个地方被重复保护
+        placeholder = self._originals.get(original)
+        if placeholder is not None:
+            return placeholder
+
+        # Avoid collisions with existing system markers or original text
+        while True:
+            placeholder = (
+                self.placeholder_format
+                .replace("{block_id}", str(self.block_id))
+                .replace("{index}", str(self.counter))
+            )
+            if placeholder not in self._scan_text and placeholder not in self.replacements:
+                break
+            self.counter += 1
+
+        self.counter += 1
+        self.replacements[placeholder] = original
+        self._originals[original] = placeholder
+        return placeholder
     
     def restore(self, text: str) -> str:
         """
@@ -124,40 +198,14 @@ class TextProtector:
         
         for idx, placeholder, original in items:
             # 统一使用模糊正则匹配，以处理模型可能产生的各种变形（全角、空格插入等）
-            # 核心修复：之前的 strict replace 无法消除模型在占位符后插入的空格
-            # 现在的正则会自动吞噬占位符后的所有空白 (\s*)
-            
-            # 针对 @P{N}@ 格式构造一个模糊正则
-            # 允许在 @ 符号和数字之间有任意空格，允许全半角混杂
-            safe_placeholder = re.escape(placeholder) # e.g. \@P1\@
-            # 构造一个能匹配 @P1@, @ P 1 @, ＠Ｐ１＠, ＠　Ｐ　１　＠ 的正则
-            # 把每个字符都变成 [字符|全角字符]\s*
-            fuzzy_pattern = ""
-            for i, char in enumerate(placeholder):
-                fw_char = self._to_mangled_potential(char)
-                if char == fw_char:
-                    char_part = re.escape(char)
-                else:
-                    char_part = f"[{re.escape(char)}{re.escape(fw_char)}]"
-                
-                # Logic for appending space consumer
-                # If aggressive_cleaning is False (SRT/TXT), we DO NOT consume trailing spaces
-                # to preserve structural newlines or intended spaces.
-                is_last = (i == len(placeholder) - 1)
-                if is_last and not self.aggressive_cleaning:
-                    fuzzy_pattern += char_part
-                else:
-                    fuzzy_pattern += char_part + r"\s*"
-            
-            try:
-                # 使用这个模糊正则寻找并替换
+            fuzzy = _fuzzy_placeholder_regex(placeholder, self.aggressive_cleaning)
+            if fuzzy is not None:
                 # CRITICAL FIX: Use lambda for replacement to prevent regex driver from
                 # interpreting backslashes in the 'original' string (e.g. {\pos} -> {os})
-                result = re.sub(fuzzy_pattern.strip(), lambda m: original, result)
-            except:
+                result = fuzzy.sub(lambda m: original, result)
+            elif placeholder in result:
                 # Fallback to strict if regex fails for some reason
-                if placeholder in result:
-                    result = result.replace(placeholder, original)
+                result = result.replace(placeholder, original)
 
         return result
 
@@ -165,12 +213,7 @@ class TextProtector:
         """
         转换字符串为可能的被损坏后的形式（全角化）。
         """
-        # 数字和下划线、字母的全角转换表
-        table = str.maketrans(
-            "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_@#!$%^&*()[]{}<>",
-            "０１２３４５６７８９ａｂｃｄｅｆｇｈｉｊｋｌｍｎｏｐｑｒｓｔｕｖｗｘｙｚＡＢＣＤＥＦＧＨＩＪＫＬＭＮＯＰＱＲＳＴＵＶＷＸＹＺ＿＠＃！＄％＾＆＊（）［］｛｝＜＞"
-        )
-        return s.translate(table)
+        return s.translate(_MANGLE_TABLE)
     
     def get_stats(self) -> Dict:
         """获取保护统计信息"""
@@ -6,11 +6,11 @@ from murasaki_translator.core.chunker import TextBlock
 
 class TxtDocument(BaseDocument):
     def load(self) -> List[Dict[str, Any]]:
-        with open(self.path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        # Plain text metadata is just the line index
-        return [{'text': line, 'meta': idx} for idx, line in enumerate(lines)]
+        # Plain text metadata is just the line index.
+        # Build items straight from the file iterator instead of readlines(),
+        # so the raw line list is never held alongside the items.
+        with open(self.path, 'r', encoding='utf-8', buffering=1 << 20) as f:
+            return [{'text': line, 'meta': idx} for idx, line in enumerate(f)]
 
     def save(self, output_path: str, blocks: List[TextBlock]):
         with open(output_path, 'w', encoding='utf-8') as f:
@@ -2,6 +2,21 @@
 假名修复器 (Kana Fixer)
 功能：移除孤立的拟声词假名（当翻译残留时清理）
 """
+import re
+from typing import AbstractSet, Iterable, Tuple
+
+
+def _compile_residue_pattern(
+    kana: AbstractSet[str], end_chars: str, japanese_ranges: Iterable[Tuple[int, int]]
+) -> "re.Pattern[str]":
+    """
+    编译候选残留假名的正则：前一字符不是日语字符，后方是结束标点或文本结尾。
+    结束标点均不在假名/汉字范围内，故"后一字符非日语"的条件被其蕴含。
+    """
+    japanese = "".join(f"\\u{lo:04X}-\\u{hi:04X}" for lo, hi in japanese_ranges)
+    kana_class = "".join(re.escape(c) for c in sorted(kana))
+    end = "".join(re.escape(c) for c in end_chars)
+    return re.compile(f"(?<![{japanese}])[{kana_class}](?=[{end}]|\\Z)")
 
 
 class KanaFixer:
@@ -32,6 +47,33 @@ class KanaFixer:
                 cls.KATAKANA_START <= code <= cls.KATAKANA_END or
                 cls.CJK_START <= code <= cls.CJK_END)
 
+    # 假名被这些符号包裹时视为特意提及的内容，予以保留
+    PROTECTION_PAIRS = {
+        '“': '”', '‘': '’', '「': '」', '『': '』', '（': '）',
+        '(': ')', '《': '》', '〈': '〉', '【': '】', '［': '］', '[': ']'
+    }
+    PROTECTION_QUOTES = frozenset(('"', "'", "`"))
+
+    # 残留假名后方的典型结束标点（或文本结尾）
+    END_CHARS = "。！？，；：”」』）〉》】］]… "
+
+    # 候选残留假名：前一字符不是日语字符，后方是结束标点或文本结尾（子类覆盖规则时重新编译）
+    _RESIDUE_RE = _compile_residue_pattern(
+        KANA_TO_CLEAN, END_CHARS,
+        ((HIRAGANA_START, HIRAGANA_END), (KATAKANA_START, KATAKANA_END), (CJK_START, CJK_END)),
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._RESIDUE_RE = _compile_residue_pattern(
+            cls.KANA_TO_CLEAN, cls.END_CHARS,
+            (
+                (cls.HIRAGANA_START, cls.HIRAGANA_END),
+                (cls.KATAKANA_START, cls.KATAKANA_END),
+                (cls.CJK_START, cls.CJK_END),
+            ),
+        )
+
     @classmethod
     def fix(cls, dst: str) -> str:
         """
@@ -42,50 +84,24 @@ class KanaFixer:
             return dst
         
         # 预先检查是否存在需要清理的假名
-        if not any(c in cls.KANA_TO_CLEAN for c in dst):
+        if cls.KANA_TO_CLEAN.isdisjoint(dst):
             return dst
 
-        result = []
-        length = len(dst)
+        # 判定条件（一次正则扫描找出候选，再排除被符号包裹的情况）：
+        # 1. 前面是非日语字符（如空格、中文标点或开头）
+        # 2. 后面是中文标点或结尾
+        return cls._RESIDUE_RE.sub(cls._drop_unprotected, dst)
 
-        for i, char in enumerate(dst):
-            if char in cls.KANA_TO_CLEAN:
-                # 检查前后语境
-                prev_char = dst[i - 1] if i > 0 else None
-                next_char = dst[i + 1] if i < length - 1 else None
-
-                # 判定条件：
-                # 1. 前面是非日语中文字符（如空格、中文标点或结尾）
-                # 2. 后面是中文标点或结尾
-                
-                is_prev_japanese = prev_char is not None and cls.is_japanese_char(prev_char)
-                is_next_japanese = next_char is not None and cls.is_japanese_char(next_char)
-
-                # 增加包裹符号保护逻辑 (Quotes/Brackets protection)
-                # 如果假名被引号、括号、书名号等包裹，通常代表它是特意提及的内容
-                PROTECTION_PAIRS = {
-                    '“': '”', '‘': '’', '「': '」', '『': '』', '（': '）', 
-                    '(': ')', '《': '》', '〈': '〉', '【': '】', '［': '］', '[': ']'
-                }
-                is_protected = False
-                if prev_char in PROTECTION_PAIRS and next_char == PROTECTION_PAIRS[prev_char]:
-                    is_protected = True
-                elif prev_char in ['"', "'", "`"] and next_char == prev_char:
-                    is_protected = True
-
-                # 判定逻辑优化
-                if is_prev_japanese or is_next_japanese or is_protected:
-                    # 如果夹在日语语境中，或是被符号包裹，保留
-                    result.append(char)
-                else:
-                    # 孤立点（如“测试 的 の” 或 “测试 の。”）
-                    # 如果后方是典型的结束标点，则该假名为残留，跳过
-                    is_at_end = next_char is None or next_char in "。！？，；：”」』）〉》】］]… "
-                    if is_at_end:
-                         continue # 移除
-                    else:
-                         result.append(char)
-            else:
-                result.append(char)
-
-        return "".join(result)
+    @classmethod
+    def _drop_unprotected(cls, match: "re.Match[str]") -> str:
+        """re.sub 回调：孤立假名移除；被引号、括号、书名号等包裹时保留"""
+        text = match.string
+        i = match.start()
+        prev_char = text[i - 1] if i > 0 else None
+        next_char = text[i + 1] if i + 1 < len(text) else None
+        if prev_char is not None:
+            if prev_char in cls.PROTECTION_PAIRS and next_char == cls.PROTECTION_PAIRS[prev_char]:
+                return match.group()
+            if prev_char in cls.PROTECTION_QUOTES and next_char == prev_char:
+                return match.group()
+        return ""
@@ -2,7 +2,9 @@
 数字修复器 (Number Fixer)
 功能：恢复圆圈数字 ①②③ 等
 """
+import itertools
 import re
+from typing import Dict, List
 
 class NumberFixer:
     # 圆圈数字列表
@@ -23,19 +25,19 @@ class NumberFixer:
     @classmethod
     def fix(cls, src: str, dst: str) -> str:
         """修复圆圈数字"""
+        # 如果原文中没有圆圈数字，跳过（先于两次 findall 判断）
+        if not cls.PATTERN_CIRCLED_NUM.search(src):
+            return dst
+
         src_nums = cls.PATTERN_ALL_NUM.findall(src)
         dst_nums = cls.PATTERN_ALL_NUM.findall(dst)
-        src_circled_nums = cls.PATTERN_CIRCLED_NUM.findall(src)
-
-        # 如果原文中没有圆圈数字，跳过
-        if not src_circled_nums:
-            return dst
 
         # 容错增强：模型有时会重复输出。
         # 如果原文数字少于译文，且前段匹配，我们依然尝试修复前部。
         # 典型的失败案例：原文 ① 译文 1 1 (重写成了两个 1)
         # 我们采用“贪心对齐”策略，只要原文数字在当前位置是圆圈，就尝试同步。
         
+        targets = {}
         limit = min(len(src_nums), len(dst_nums))
         for i in range(limit):
             src_num_str = src_nums[i]
@@ -50,10 +52,20 @@ class NumberFixer:
             # 检查译文是否是阿拉伯数字且数值匹配
             # 注：这里做了一个简化，如果原文位置是圆圈，译文对应位置是阿拉伯数字，就直接还原
             if dst_num_int > 0:
-                # 修复该位置
-                dst = cls.fix_by_index(dst, i, src_num_str)
+                targets[i] = src_num_str
 
-        return dst
+        # 替换成单个圆圈数字不会改变其余匹配的序号，所有位置可以一次 sub 完成
+        return cls.fix_by_indexes(dst, targets) if targets else dst
+
+    @classmethod
+    def fix_batch(cls, src_lines: List[str], dst_lines: List[str]) -> List[str]:
+        """
+        批量修复，等价于 [fix(src, dst) for src, dst in zip(src_lines, dst_lines)]
+        :param src_lines: 原文行
+        :param dst_lines: 译文行
+        """
+        fix = cls.fix
+        return [fix(src, dst) for src, dst in zip(src_lines, dst_lines)]
 
     @classmethod
     def safe_int(cls, s: str) -> int:
@@ -66,14 +78,14 @@ class NumberFixer:
     @classmethod
     def fix_by_index(cls, dst: str, target_i: int, target_str: str) -> str:
         """通过索引修复"""
-        i = [0]
+        return cls.fix_by_indexes(dst, {target_i: target_str})
+
+    @classmethod
+    def fix_by_indexes(cls, dst: str, targets: Dict[int, str]) -> str:
+        """通过索引批量修复：targets 为 {匹配序号: 替换文本}，一次扫描完成"""
+        counter = itertools.count()
 
         def repl(m: re.Match) -> str:
-            if i[0] == target_i:
-                i[0] += 1
-                return target_str
-            else:
-                i[0] += 1
-                return m.group(0)
+            return targets.get(next(counter), m.group(0))
 
         return cls.PATTERN_ALL_NUM.sub(repl, dst)
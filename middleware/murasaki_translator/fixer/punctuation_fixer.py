@@ -3,6 +3,8 @@
 功能：全角/半角标点转换、引号修复
 """
 import re
+from collections import Counter
+from typing import List, Tuple
 
 class PunctuationFixer:
     # 数量匹配规则 A：全角 -> 半角
@@ -26,14 +28,15 @@ class PunctuationFixer:
         ")": ("）", ),
         "（": ("(", ),
         "）": (")", ),
-        "「": ("'", """, "『"),
-        "」": ("'", """, "』"),
-        "『": ("'", """, "「"),
-        "』": ("'", """, "」"),
-        "'": (""", "「", "『"),
-        "'": (""", "」", "』"),
-        """: ("'", "「", "『"),
-        """: ("'", "」", "』"),
+        # 弯引号统一用转义书写，避免被编辑器/工具替换成直引号
+        "「": ("\u2018", "\u201c", "『"),     # ‘ “
+        "」": ("\u2019", "\u201d", "』"),     # ’ ”
+        "『": ("\u2018", "\u201c", "「"),
+        "』": ("\u2019", "\u201d", "」"),
+        "\u2018": ("\u201c", "「", "『"),
+        "\u2019": ("\u201d", "」", "』"),
+        "\u201c": ("\u2018", "「", "『"),
+        "\u201d": ("\u2019", "」", "』"),
     }
 
     # 数量匹配规则 B：半角 -> 全角
@@ -48,9 +51,24 @@ class PunctuationFixer:
 
     # 强制替换规则（CJK 语言）
     RULE_FORCE_CJK = {
-        "「": """,
-        "」": """,
+        "「": "\u201c",
+        "」": "\u201d",
     }
+    _FORCE_CJK_TABLE = str.maketrans(RULE_FORCE_CJK)
+    _FORCE_CJK_KEYSET = frozenset(RULE_FORCE_CJK)
+
+    # 数量匹配规则只在原文含有规则键时才可能命中（check 要求 num_s_x > 0）
+    _SAME_COUNT_KEYS = frozenset(RULE_SAME_COUNT_A) | frozenset(RULE_SAME_COUNT_B)
+
+    # 原文结尾标点（触发末尾对齐）
+    _END_PUNCT = frozenset(("。", "！", "？", "!", "?", "…"))
+
+    # 首尾引号集合（fix_start_end 使用，按首/尾单字符查表）
+    _ANY_OPEN_QUOTE = frozenset(("'", '"', "\u2018", "\u201c", "「", "『"))
+    _ANY_CLOSE_QUOTE = frozenset(("'", '"', "\u2019", "\u201d", "」", "』"))
+    # 原文首/尾引号 -> 是否仅在目标语言为 CJK 时才同步到译文
+    _SRC_OPEN_FIXUP = {"「": False, "『": False, "\u2018": True, "\u201c": True}
+    _SRC_CLOSE_FIXUP = {"」": False, "』": False, "\u2019": True, "\u201d": True}
 
     @classmethod
     def fix(cls, src: str, dst: str, target_is_cjk: bool = True) -> str:
@@ -68,64 +86,93 @@ class PunctuationFixer:
         
         # 强制末尾对齐（。！？）
         # 如果原文以结束标点结尾，而译文没有，则强制补全
-        if src.strip().endswith(("。", "！", "？", "!", "?", "…")):
+        # 只需原文去空白后的末字符，不必复制整串
+        src_tail = src.rstrip()[-1:]
+        if src_tail in cls._END_PUNCT:
             stripped_dst = dst.rstrip()
             if stripped_dst and not stripped_dst.endswith(("。", "！", "？", "!", "?", "…", "”", "」", "』")):
                  # 取原文最后一个标点并转换为对应全角（若是 CJK）
-                 last_punc = src.strip()[-1]
+                 last_punc = src_tail
                  if target_is_cjk:
                      punc_map = {"!": "！", "?": "？", ".": "。"}
                      last_punc = punc_map.get(last_punc, last_punc)
                  dst = stripped_dst + last_punc
 
-        # 应用数量匹配规则
-        dst = cls.apply_fix_rules(src, dst, cls.RULE_SAME_COUNT_A)
-        dst = cls.apply_fix_rules(src, dst, cls.RULE_SAME_COUNT_B)
+        # 应用数量匹配规则（字符计数只统计一次，替换时增量更新）
+        if not cls._SAME_COUNT_KEYS.isdisjoint(src):
+            src_counts = Counter(src)
+            dst_counts = Counter(dst)
+            # A、B 两组命中的规则合成一张表，只需一次 translate
+            table = {}
+            cls._compose_fix_rules(src_counts, dst_counts, cls.RULE_SAME_COUNT_A, table)
+            cls._compose_fix_rules(src_counts, dst_counts, cls.RULE_SAME_COUNT_B, table)
+            if table:
+                dst = dst.translate(table)
         
-        # CJK 强制规则
-        if target_is_cjk:
-            for key, value in cls.RULE_FORCE_CJK.items():
-                dst = dst.replace(key, value)
+        # CJK 强制规则（键通常不在译文中，先做一次成员判断）
+        if target_is_cjk and not cls._FORCE_CJK_KEYSET.isdisjoint(dst):
+            dst = dst.translate(cls._FORCE_CJK_TABLE)
         
         return dst
 
     @classmethod
-    def check(cls, src: str, dst: str, key: str, value: tuple) -> bool:
-        """检查是否需要修复"""
-        num_s_x = src.count(key)
-        num_s_y = sum(src.count(t) for t in value)
-        num_t_x = dst.count(key)
-        num_t_y = sum(dst.count(t) for t in value)
-        
-        return (num_s_x > 0 and 
-                num_s_x != num_s_y and 
-                num_s_x > num_t_x and 
-                num_s_x == num_t_x + num_t_y)
+    def fix_batch(cls, pairs: List[Tuple[str, str]], target_is_cjk: bool = True) -> List[str]:
+        """
+        批量修复标点符号，等价于 [fix(src, dst) for src, dst in pairs]
+        :param pairs: (原文, 译文) 列表
+        :param target_is_cjk: 目标语言是否为 CJK
+        """
+        fix = cls.fix
+        return [fix(src, dst, target_is_cjk) for src, dst in pairs]
 
     @classmethod
-    def apply_fix_rules(cls, src: str, dst: str, rules: dict) -> str:
-        """应用修复规则"""
+    def check(cls, src_counts: Counter, dst_counts: Counter, key: str, value: tuple) -> bool:
+        """检查是否需要修复（参数为原文/译文的字符计数）"""
+        # 按最常见的不命中情况依次提前返回，多数调用只需一两次查找
+        num_s_x = src_counts[key]
+        if num_s_x == 0:
+            return False
+        num_t_x = dst_counts[key]
+        if num_s_x <= num_t_x:
+            return False
+        if num_s_x == sum(src_counts[t] for t in value):
+            return False
+        return num_s_x == num_t_x + sum(dst_counts[t] for t in value)
+
+    @classmethod
+    def apply_fix_rules(cls, src_counts: Counter, dst: str, dst_counts: Counter, rules: dict) -> str:
+        """应用修复规则，并同步更新 dst_counts"""
+        table = {}
+        cls._compose_fix_rules(src_counts, dst_counts, rules, table)
+        return dst.translate(table) if table else dst
+
+    @classmethod
+    def _compose_fix_rules(cls, src_counts: Counter, dst_counts: Counter, rules: dict, table: dict) -> None:
+        """按顺序判定规则，把命中的替换复合进 table（等价于按顺序逐个 replace）"""
         for key, value in rules.items():
-            if cls.check(src, dst, key, value):
+            if cls.check(src_counts, dst_counts, key, value):
+                # 与先前命中的规则复合
+                for c, mapped in table.items():
+                    if mapped in value:
+                        table[c] = key
                 for t in value:
-                    dst = dst.replace(t, key)
-        return dst
+                    table.setdefault(ord(t), key)
+                    dst_counts[key] += dst_counts[t]
+                    dst_counts[t] = 0
 
     @classmethod
     def fix_start_end(cls, src: str, dst: str, target_is_cjk: bool) -> str:
         """修正首尾引号"""
         # 修正开头引号
-        if dst.startswith(("'", '"', "'", """, "「", "『")):
-            if src.startswith(("「", "『")):
-                dst = f"{src[0]}{dst[1:]}"
-            elif target_is_cjk and src.startswith(("'", """)):
+        if dst[:1] in cls._ANY_OPEN_QUOTE:
+            cjk_only = cls._SRC_OPEN_FIXUP.get(src[:1])
+            if cjk_only is not None and (target_is_cjk or not cjk_only):
                 dst = f"{src[0]}{dst[1:]}"
         
         # 修正结尾引号
-        if dst.endswith(("'", '"', "'", """, "」", "』")):
-            if src.endswith(("」", "』")):
-                dst = f"{dst[:-1]}{src[-1]}"
-            elif target_is_cjk and src.endswith(("'", """)):
+        if dst[-1:] in cls._ANY_CLOSE_QUOTE:
+            cjk_only = cls._SRC_CLOSE_FIXUP.get(src[-1:])
+            if cjk_only is not None and (target_is_cjk or not cjk_only):
                 dst = f"{dst[:-1]}{src[-1]}"
         
         return dst
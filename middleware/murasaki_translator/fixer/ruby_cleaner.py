@@ -3,43 +3,138 @@
 功能：移除日文文本中的 Ruby 注音标记
 """
 import re
+import sys
+from typing import Optional
+
+# re 自 Python 3.11 起支持占有量词。规则中的 "*+" 只用于 "[^X\n]*++X" 形式：
+# 字符类排除了其后的字面量，回溯不可能产生新的匹配，因此在不支持的版本上
+# 去掉 "+" 结果不变（只是失败时多一些无效回溯）
+_HAS_POSSESSIVE = sys.version_info >= (3, 11)
+
+
+def _compile(pattern: str) -> "re.Pattern[str]":
+    """编译忽略大小写的规则正则"""
+    if not _HAS_POSSESSIVE:
+        pattern = pattern.replace("*+", "*")
+    return re.compile(pattern, flags=re.IGNORECASE)
 
 
 class RubyCleaner:
+    # 注："(.+?)X" 在其后剩余部分不依赖 X 之后内容时，等价于 "(.[^X\n]*++)X"，
+    # 后者（占有量词）在每个起点上只线性扫描一次、不回溯，这里对满足条件的规则统一改写；
+    # 其余惰性匹配保持原样。
+
+    # 规则以 (正则源码, 替换串) 给出，首次使用时才编译（见 _compiled_rules），
+    # 只导入而不清理注音的进程（服务端、子进程）无需付出编译开销
+
     # 保守规则（适用于所有文本类型，低误伤）
     CONSERVATIVE_RULES = (
         # \\r[漢字,かんじ]
-        (re.compile(r"\\r\[(.+?),.+?\]", flags=re.IGNORECASE), r"\1"),
+        (r"\\r\[(.[^,\n]*+),.[^\]\n]*+\]", r"\1"),
         # \\rb[漢字,かんじ]
-        (re.compile(r"\\rb\[(.+?),.+?\]", flags=re.IGNORECASE), r"\1"),
+        (r"\\rb\[(.[^,\n]*+),.[^\]\n]*+\]", r"\1"),
         # [r_かんじ][ch_漢字]
-        (re.compile(r"\[r_.+?\]\[ch_(.+?)\]", flags=re.IGNORECASE), r"\1"),
+        (r"\[r_.+?\]\[ch_(.[^\]\n]*+)\]", r"\1"),
         # [ch_漢字]
-        (re.compile(r"\[ch_(.+?)\]", flags=re.IGNORECASE), r"\1"),
+        (r"\[ch_(.[^\]\n]*+)\]", r"\1"),
         # <ruby = かんじ>漢字</ruby>
-        (re.compile(r"<ruby\s*=\s*.*?>(.*?)</ruby>", flags=re.IGNORECASE), r"\1"),
+        (r"<ruby\s*=\s*.*?>(.*?)</ruby>", r"\1"),
         # <ruby><rb>漢字</rb><rtc><rt>かんじ</rt></rtc></ruby>
-        (re.compile(r"<ruby>.*?<rb>(.*?)</rb>.*?</ruby>", flags=re.IGNORECASE), r"\1"),
+        (r"<ruby>.*?<rb>(.*?)</rb>.*?</ruby>", r"\1"),
         # [ruby text=かんじ]
-        (re.compile(r"\[ruby text\s*=\s*.*?\]", flags=re.IGNORECASE), ""),
+        (r"\[ruby text\s*=\s*[^\]\n]*+\]", ""),
         # 网文格式：｜漢字《かんじ》
-        (re.compile(r"｜(.+?)《.+?》", flags=re.IGNORECASE), r"\1"),
+        (r"｜(.[^《\n]*+)《.[^》\n]*+》", r"\1"),
         # 网文格式：｜漢字［かんじ］
-        (re.compile(r"｜(.+?)［.+?］", flags=re.IGNORECASE), r"\1"),
+        (r"｜(.[^［\n]*+)［.[^］\n]*+］", r"\1"),
     )
 
     # 激进规则（可能误伤正常括号或书名号）
     AGGRESSIVE_RULES = (
         # (漢字/かんじ)
-        (re.compile(r"\((.+)/.+\)", flags=re.IGNORECASE), r"\1"),
+        (r"\((.+)/.+\)", r"\1"),
         # [漢字/かんじ]
-        (re.compile(r"\[(.+)/.+\]", flags=re.IGNORECASE), r"\1"),
+        (r"\[(.+)/.+\]", r"\1"),
         # |漢字[かんじ]
-        (re.compile(r"\|(.+?)\[.+?\]", flags=re.IGNORECASE), r"\1"),
+        (r"\|(.[^\[\n]*+)\[.[^\]\n]*+\]", r"\1"),
         # 孤立书名号注音：漢字《かんじ》
-        (re.compile(r"([^\W_])《.+?》", flags=re.IGNORECASE), r"\1"),
+        (r"([^\W_])《.[^》\n]*+》", r"\1"),
+    )
+
+    # 每条规则命中所必需的字符（均不受大小写影响），与规则一一对应。
+    # 文本缺少其中任一字符时跳过该条规则的整段扫描，只对可能命中的规则运行正则
+    _CONSERVATIVE_REQUIRED = (
+        ("\\", "[", ",", "]"),
+        ("\\", "[", ",", "]"),
+        ("[", "_", "]"),
+        ("[", "_", "]"),
+        ("<", "=", "</"),
+        ("<", ">", "</"),
+        ("[", "=", "]"),
+        ("｜", "《", "》"),
+        ("｜", "［", "］"),
+    )
+    _AGGRESSIVE_REQUIRED = (
+        ("(", "/", ")"),
+        ("[", "/", "]"),
+        ("|", "[", "]"),
+        ("《", "》"),
     )
 
+    # 各类自己的编译结果 (规则源码, 编译后的规则)，由 _compiled_rules 按类填充
+    _compiled: Optional[tuple] = None
+
+    @staticmethod
+    def _bind_required(rules: tuple, required: tuple) -> tuple:
+        """把每条规则的必需字符并入 (正则, 替换串, 必需字符)；规则被覆盖而长度不符时不做跳过"""
+        if len(required) != len(rules):
+            required = ((),) * len(rules)
+        return tuple(
+            (_compile(pattern), replacement, chars)
+            for (pattern, replacement), chars in zip(rules, required)
+        )
+
+    @classmethod
+    def _compiled_rules(cls) -> tuple:
+        """
+        返回 (保守规则, 激进规则)，每条为 (编译后的正则, 替换串, 必需字符)。
+        每个进程每组规则只编译一次；规则或必需字符被替换（子类覆盖或运行时重新赋值）时重新编译。
+        """
+        sources = (
+            cls.CONSERVATIVE_RULES,
+            cls._CONSERVATIVE_REQUIRED,
+            cls.AGGRESSIVE_RULES,
+            cls._AGGRESSIVE_REQUIRED,
+        )
+        cached = cls.__dict__.get("_compiled")
+        if cached is None or any(old is not new for old, new in zip(cached[0], sources)):
+            compiled = (
+                cls._bind_required(sources[0], sources[1]),
+                cls._bind_required(sources[2], sources[3]),
+            )
+            cached = (sources, compiled)
+            cls._compiled = cached
+        return cached[1]
+
+    @classmethod
+    def precompile(cls) -> None:
+        """
+        立即编译规则。以 fork 方式创建进程池前在父进程调用，子进程即可通过写时复制直接继承；
+        spawn 方式下子进程会重新导入模块，仍在各自首次使用时编译一次。
+        """
+        cls._compiled_rules()
+
+    @staticmethod
+    def _apply_rules(text: str, rules: tuple) -> str:
+        """按序逐条替换；文本缺少某条规则的任一必需字符时跳过该条规则"""
+        for pattern, replacement, chars in rules:
+            for c in chars:
+                if c not in text:
+                    break
+            else:
+                text = pattern.sub(replacement, text)
+        return text
+
     @classmethod
     def clean(cls, text: str, aggressive: bool = False) -> str:
         """
@@ -49,14 +144,14 @@ class RubyCleaner:
         """
         if not text:
             return text
-        
-        # 始终应用保守规则
-        for pattern, replacement in cls.CONSERVATIVE_RULES:
-            text = pattern.sub(replacement, text)
+
+        conservative, aggressive_rules = cls._compiled_rules()
+
+        # 始终应用保守规则（逐条按序替换，保证嵌套标记的处理顺序不变）
+        text = cls._apply_rules(text, conservative)
 
         # 激进模式额外应用规则
         if aggressive:
-            for pattern, replacement in cls.AGGRESSIVE_RULES:
-                text = pattern.sub(replacement, text)
+            text = cls._apply_rules(text, aggressive_rules)
 
         return text
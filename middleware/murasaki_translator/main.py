@@ -8,8 +8,9 @@ import re
 import subprocess
 import threading
 import shutil  # [修复] 用于备份损坏的缓存文件
+from itertools import accumulate, islice
 from contextlib import nullcontext
-from typing import List, Dict, Optional
+from typing import Callable, Iterable, List, Dict, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, Future, as_completed
 
 from pathlib import Path
@@ -29,9 +30,22 @@ sys.stderr.reconfigure(encoding='utf-8')
 stdout_lock = threading.Lock()
 
 def safe_print_json(prefix, data):
-    """Thread-safe JSON printing to stdout."""
+    """Thread-safe JSON printing to stdout (serialized before taking the lock)."""
+    # 预览类负载可达数十 KB：正文串直接写出，不再为拼接前后缀额外复制一份
+    body = json.dumps(data, ensure_ascii=False)
     with stdout_lock:
-        sys.stdout.write(f"\n{prefix}:{json.dumps(data, ensure_ascii=False)}\n")
+        sys.stdout.write(f"\n{prefix}:")
+        sys.stdout.write(body)
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
+def safe_print_json_batch(prefix, items):
+    """Thread-safe JSON printing of several records with one write and one flush."""
+    if not items:
+        return
+    payload = "".join(f"\n{prefix}:{json.dumps(data, ensure_ascii=False)}\n" for data in items)
+    with stdout_lock:
+        sys.stdout.write(payload)
         sys.stdout.flush()
 
 def safe_print(msg):
@@ -39,6 +53,17 @@ def safe_print(msg):
     with stdout_lock:
         print(msg)
 
+# 暂停期间只由一个 worker 轮询暂停文件，其余 worker 在锁上等待
+_pause_lock = threading.Lock()
+
+def wait_while_paused(pause_file: str, poll_interval: float = 0.5) -> None:
+    """暂停文件存在时阻塞，直到其被删除（GUI 恢复翻译）。"""
+    if not os.path.exists(pause_file):
+        return
+    with _pause_lock:
+        while os.path.exists(pause_file):
+            time.sleep(poll_interval)
+
 def _estimate_cot_ratio_for_ctx(ctx_value: int) -> float:
     if ctx_value >= 8192:
         return 3.2
@@ -64,7 +89,7 @@ from murasaki_translator.core.chunker import Chunker, TextBlock
 from murasaki_translator.core.prompt import PromptBuilder
 from murasaki_translator.core.engine import InferenceEngine
 from murasaki_translator.core.parser import ResponseParser
-from murasaki_translator.core.quality_checker import QualityChecker, format_warnings_for_log, calculate_glossary_coverage
+from murasaki_translator.core.quality_checker import QualityChecker, format_warnings_for_log, calculate_glossary_coverage, find_relevant_terms
 from murasaki_translator.core.text_protector import TextProtector  # [Experimental] 占位符保护
 from murasaki_translator.core.anchor_guard import (
     normalize_anchor_stream as _shared_normalize_anchor_stream,
@@ -150,6 +175,40 @@ def load_glossary(path: Optional[str]) -> Dict[str, str]:
         print(f"[Warning] Failed to load glossary {os.path.basename(path)}: {e}")
         return {}
 
+def _start_server_in_background(engine) -> Tuple[Callable[[], None], Callable[[], None]]:
+    """
+    在后台线程中启动 llama-server（加载模型通常需要数秒到数十秒），
+    让主线程同时读取并切分输入文档。返回 (wait, cancel)：
+    wait() 阻塞到服务就绪，并在主线程重新抛出启动过程中的异常；
+    cancel() 供提前退出时使用，取消启动并等待线程结束，之后 stop_server() 才不会漏掉随后拉起的进程。
+    """
+    errors: List[BaseException] = []
+
+    def run():
+        try:
+            engine.start_server()
+        except BaseException as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run, name="llama-server-start", daemon=True)
+    thread.start()
+
+    def join():
+        # 带超时轮询，保证等待期间 Ctrl+C 在 Windows 上也能及时响应
+        while thread.is_alive():
+            thread.join(0.5)
+
+    def wait():
+        join()
+        if errors:
+            raise errors[0]
+
+    def cancel():
+        engine.cancel_start()
+        join()
+
+    return wait, cancel
+
 def load_rules(path: Optional[str]) -> List[Dict]:
     """Load rules from JSON file."""
     if not path or not os.path.exists(path):
@@ -162,6 +221,12 @@ def load_rules(path: Optional[str]) -> List[Dict]:
         return []
 
 
+# 续翻时检测 summary（完整翻译标志）的尾部窗口与标记
+_SUMMARY_TAIL_BYTES = 4096
+_SUMMARY_RULE_BYTES = b'=' * 20
+_SUMMARY_TITLE_BYTES = b'Translation Summary'
+
+
 def load_existing_output(output_path: str) -> tuple:
     """
     加载已有输出文件，用于增量翻译。
@@ -171,6 +236,14 @@ def load_existing_output(output_path: str) -> tuple:
         return 0, [], False
     
     try:
+        # summary 写在文件末尾：先只读尾部检查，已完成的大文件无需整体读入
+        with open(output_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - _SUMMARY_TAIL_BYTES))
+            tail = f.read()
+        if _SUMMARY_RULE_BYTES in tail and _SUMMARY_TITLE_BYTES in tail:
+            return -1, [], False
+        
         with open(output_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
@@ -183,7 +256,7 @@ def load_existing_output(output_path: str) -> tuple:
         lines = content.split('\n')
         # 如果文件以换行符结尾，内容中的最后一个空字符串是 split 产生的噪音，移除它
         if content.endswith('\n'):
-            lines = lines[:-1]
+            lines.pop()
             
         return len(lines), lines, True
     except Exception as e:
@@ -191,18 +264,48 @@ def load_existing_output(output_path: str) -> tuple:
         return 0, [], False
 
 
-def get_missed_terms(source_text: str, translated_text: str, glossary: Dict[str, str]) -> List[tuple]:
+def scan_lines(lines: Iterable[str]) -> Tuple[int, int]:
+    """
+    一次遍历统计非空白行的行数与字符数。
+    用 isspace() 判断空白行（与 strip() 判定一致），不为每行分配 strip 副本。
+    """
+    count = 0
+    chars = 0
+    for line in lines:
+        if line and not line.isspace():
+            count += 1
+            chars += len(line)
+    return count, chars
+
+
+def count_nonempty_lines(lines: Iterable[str]) -> int:
+    """统计非空白行数"""
+    return sum(1 for line in lines if line and not line.isspace())
+
+
+def get_missed_terms(source_text: str, translated_text: str, glossary: Dict[str, str],
+                     relevant_terms: Optional[Dict[str, str]] = None) -> List[tuple]:
     """
     获取原文中出现但译文中未正确翻译的术语列表。
+    relevant_terms 可传入预先计算的 find_relevant_terms(source_text, glossary)。
     返回 [(原文术语, 目标译文), ...]
     """
-    missed = []
-    for src_term, dst_term in glossary.items():
-        # 排除单字术语
-        if len(src_term) > 1 and src_term in source_text:
-            if dst_term not in translated_text:
-                missed.append((src_term, dst_term))
-    return missed
+    if relevant_terms is None:
+        relevant_terms = find_relevant_terms(source_text, glossary)
+    return [
+        (src_term, dst_term)
+        for src_term, dst_term in relevant_terms.items()
+        if dst_term not in translated_text
+    ]
+
+
+# 重试反馈模板（预先绑定 format，重试时不再逐次拼接 f-string）
+_FEEDBACK_TERM_FMT = "「{}」→「{}」".format
+_FEEDBACK_TMPL = (
+    "\n\n【系统提示】上一轮翻译中以下术语未正确应用：{}。"
+    "请在本次翻译中严格使用术语表中的标准译法，不要擅自简化或省略。"
+).format
+_FEEDBACK_MAX_TERMS = 5
 
 
 def build_retry_feedback(missed_terms: List[tuple], coverage: float) -> str:
@@ -213,13 +316,13 @@ def build_retry_feedback(missed_terms: List[tuple], coverage: float) -> str:
         return ""
     
     # 构建术语列表
-    terms_str = "、".join([f"「{src}」→「{dst}」" for src, dst in missed_terms[:5]])
-    if len(missed_terms) > 5:
+    terms_str = "、".join(
+        _FEEDBACK_TERM_FMT(src, dst) for src, dst in islice(missed_terms, _FEEDBACK_MAX_TERMS)
+    )
+    if len(missed_terms) > _FEEDBACK_MAX_TERMS:
         terms_str += f" 等 {len(missed_terms)} 项"
     
-    feedback = f"\n\n【系统提示】上一轮翻译中以下术语未正确应用：{terms_str}。请在本次翻译中严格使用术语表中的标准译法，不要擅自简化或省略。"
-    
-    return feedback
+    return _FEEDBACK_TMPL(terms_str)
 
 
 def _parse_protect_pattern_lines(lines: List[str]) -> tuple:
@@ -421,11 +524,13 @@ def translate_block_with_retry(
     glossary,
     stdout_lock,
     strict_mode: bool,
-    protector=None
+    protector=None,
+    quality_checker=None
 ):
     """
     Unified A/B/C/D retry strategy for a single block.
     Used by both batch translation and single-block re-translation.
+    quality_checker: shared QualityChecker for the run; built from glossary when omitted.
     """
     raw_original_src_text = original_src_text
     working_original_src_text = original_src_text
@@ -454,11 +559,17 @@ def translate_block_with_retry(
         enable_cot=args.debug,
         preset=args.preset
     )
+    # 术语反馈注入到最后一条 user 消息；其位置在各次重试间不变，只查找一次
+    feedback_user_idx = next(
+        (j for j in range(len(messages) - 1, -1, -1) if messages[j].get("role") == "user"),
+        None,
+    )
     
     global_attempts = 0
     glossary_attempts = 0
     retry_reason = None
     last_missed_terms = []
+    block_glossary_terms = None  # 本块原文中出现的术语（首次术语检查时计算）
     last_coverage = 0.0
     best_result = None
     retry_history = []  # Track all retry attempts for debugging
@@ -501,25 +612,36 @@ def translate_block_with_retry(
         messages_for_attempt = messages
         if attempt > 0 and args.retry_prompt_feedback and glossary and last_missed_terms and retry_reason == 'glossary':
             feedback = build_retry_feedback(last_missed_terms, last_coverage)
-            if feedback:
-                messages_for_attempt = messages.copy()
-                for j in range(len(messages_for_attempt) - 1, -1, -1):
-                    if messages_for_attempt[j].get("role") == "user":
-                        messages_for_attempt[j] = {
-                            "role": "user",
-                            "content": messages_for_attempt[j]["content"] + feedback
-                        }
-                        break
+            if feedback and feedback_user_idx is not None:
+                j = feedback_user_idx
+                messages_for_attempt = messages[:j] + [{
+                    "role": "user",
+                    "content": messages[j]["content"] + feedback
+                }] + messages[j + 1:]
         
-        accumulated_output = ""
+        # 只跟踪思考段状态，不再累积整段输出（每个 chunk 都 strip/搜索全文是 O(n²)）
+        think_head = ""      # 输出去除前导空白后的前 7 个字符
+        think_tail = ""      # 输出末尾 7 个字符，用于检测跨 chunk 的 </think>
+        think_closed = False
         def on_stream_chunk(chunk):
-            nonlocal accumulated_output
-            accumulated_output += chunk
-            if "<think>" in chunk or "</think>" in chunk or (accumulated_output.strip().startswith("<think>") and not "</think>" in accumulated_output):
+            nonlocal think_head, think_tail, think_closed
+            if len(think_head) < 7:
+                think_head = (think_head + chunk).lstrip()[:7]
+                if len(think_head) == 7 and think_head != "<think>":
+                    # 开头已确定不是思考段：尾部窗口只影响思考段内的判定，直接视为已结束
+                    think_closed = True
+            if not think_closed:
+                # 思考段结束后尾部窗口不再需要，之后每个 token 只剩两次子串判断
+                if "</think>" in think_tail + chunk:
+                    think_closed = True
+                think_tail = (think_tail + chunk)[-7:]
+            if "<think>" in chunk or "</think>" in chunk or (think_head == "<think>" and not think_closed):
+                # 逐 token 只写入缓冲区，不单独 flush（前端与远程 worker 均不实时消费思考增量）；
+                # 流结束后或下一条 safe_print_json 时统一刷出
                 try:
+                    line = f"\nJSON_THINK_DELTA:{json.dumps(chunk, ensure_ascii=False)}\n"
                     with stdout_lock:
-                        sys.stdout.write(f"\nJSON_THINK_DELTA:{json.dumps(chunk, ensure_ascii=False)}\n")
-                        sys.stdout.flush()
+                        sys.stdout.write(line)
                 except: pass
 
         full_response_text, block_usage = engine.chat_completion(
@@ -532,6 +654,8 @@ def translate_block_with_retry(
             rep_step=args.rep_penalty_step,
             block_id=block_idx + 1
         )
+        with stdout_lock:
+            sys.stdout.flush()
         
         raw_output = full_response_text
         parsed_lines, cot_content = response_parser.parse(raw_output or "", expected_count=0)
@@ -583,8 +707,8 @@ def translate_block_with_retry(
                 structural_retry_happened = True
 
             if not anchor_missing:
-                src_line_count = len([l for l in working_original_src_text.splitlines() if l.strip()])
-                dst_line_count = len([l for l in parsed_lines if l.strip()])
+                src_line_count = count_nonempty_lines(working_original_src_text.splitlines())
+                dst_line_count = count_nonempty_lines(parsed_lines)
                 diff = abs(dst_line_count - src_line_count)
                 if diff > 0:
                     if global_attempts < args.max_retries:
@@ -604,8 +728,8 @@ def translate_block_with_retry(
                         continue
                     structural_retry_happened = True
         else:
-            src_line_count = len([l for l in working_original_src_text.splitlines() if l.strip()])
-            dst_line_count = len([l for l in parsed_lines if l.strip()])
+            src_line_count = count_nonempty_lines(working_original_src_text.splitlines())
+            dst_line_count = count_nonempty_lines(parsed_lines)
             diff = abs(dst_line_count - src_line_count)
             pct_diff = diff / max(1, src_line_count)
             
@@ -690,12 +814,18 @@ def translate_block_with_retry(
 
         if glossary and args.output_hit_threshold > 0 and not structural_retry_happened:
             translated_text = '\n'.join(parsed_lines)
+            if block_glossary_terms is None:
+                # 原文在各次重试间不变，本块出现的术语只筛选一次
+                block_glossary_terms = find_relevant_terms(raw_original_src_text, glossary)
             passed, coverage, cot_coverage, hit, total = calculate_glossary_coverage(
                 raw_original_src_text, translated_text, glossary, cot_content,
-                args.output_hit_threshold, args.cot_coverage_threshold
+                args.output_hit_threshold, args.cot_coverage_threshold,
+                relevant_terms=block_glossary_terms
             )
             last_coverage = coverage
-            last_missed_terms = get_missed_terms(raw_original_src_text, translated_text, glossary)
+            last_missed_terms = get_missed_terms(
+                raw_original_src_text, translated_text, glossary, relevant_terms=block_glossary_terms
+            )
             
             if best_result is None or coverage > best_result[3]:
                 best_result = (parsed_lines.copy(), cot_content, raw_output, coverage, block_usage)
@@ -746,11 +876,11 @@ def translate_block_with_retry(
     
     warnings = []
     try:
-        qc = QualityChecker(glossary=glossary)
+        qc = quality_checker if quality_checker is not None else QualityChecker(glossary=glossary)
         qc_source_lang = "ja"
         warnings = qc.check_output(
-            [l for l in raw_original_src_text.split('\n') if l.strip()],
-            [l for l in processed_text.split('\n') if l.strip()], 
+            [l for l in raw_original_src_text.split('\n') if l and not l.isspace()],
+            [l for l in processed_text.split('\n') if l and not l.isspace()],
             source_lang=qc_source_lang
         )
     except Exception as e:
@@ -765,7 +895,7 @@ def translate_block_with_retry(
         "cot": final_output["cot"],
         "raw_output": final_output["raw"],
         "warnings": warnings,
-        "lines_count": len([l for l in processed_text.splitlines() if l.strip()]),
+        "lines_count": count_nonempty_lines(processed_text.splitlines()),
         "chars_count": len(raw_original_src_text),
         "cot_chars": len(final_output["cot"]),
         "usage": final_output["usage"],
@@ -774,31 +904,66 @@ def translate_block_with_retry(
     }
 
 
-def calculate_skip_blocks(blocks, existing_lines: int, is_chunk_mode: bool = False) -> int:
+# 流式输出文件的缓冲区大小：按块写入后显式 flush，避免行缓冲下每个换行都触发一次系统调用
+_STREAM_BUFFER_SIZE = 1 << 16
+# 译文/CoT 文件每写入这么多块才 flush 一次（续翻以逐块 flush 的 temp 进度文件为准，文件关闭时会刷出剩余内容）
+_OUTPUT_FLUSH_INTERVAL = 32
+
+
+def block_line_counts(blocks) -> List[int]:
+    """每个块的输入行数（即应有的输出行数），供断点续传计算与重建复用"""
+    return [block.prompt_text.count('\n') + 1 for block in blocks]
+
+
+def calculate_skip_blocks(blocks, existing_lines: int, is_chunk_mode: bool = False,
+                          line_counts: Optional[Iterable[int]] = None) -> int:
     """
     根据已翻译行数计算应该跳过的块数。
     采用保守策略：只跳过完全匹配的块。
+    line_counts 可传入预先计算的 block_line_counts(blocks)。
     """
     if existing_lines <= 0:
         return 0
+    if line_counts is None:
+        # 惰性计数：扫描停在第一个不完整的块，其后的块无需统计
+        line_counts = (block.prompt_text.count('\n') + 1 for block in blocks)
     
-    cumulative_lines = 0
-    for i, block in enumerate(blocks):
-        # 估算这个块的应有输出行数（与输入行数相同）
-        block_lines = block.prompt_text.count('\n') + 1
-        
-        # 分块模式下，每个块输出后会多加一个空行
-        physical_lines = block_lines + 1 if is_chunk_mode else block_lines
-        
-        # 如果当前块全部加入后超过了已有行数，说明此块不完整或未开始
-        if cumulative_lines + physical_lines > existing_lines:
+    # 分块模式下，每个块输出后会多加一个空行
+    extra = 1 if is_chunk_mode else 0
+    # 累计物理行数严格递增：第一个超过已有行数的块即不完整或未开始的块
+    for i, cumulative in enumerate(accumulate(n + extra for n in line_counts)):
+        if cumulative > existing_lines:
             return i
-            
-        cumulative_lines += physical_lines
-    
     return len(blocks)
 
 
+def _nvml_gpu_names() -> List[str]:
+    """通过 NVML (pynvml) 直接读取 NVIDIA GPU 名称，不可用时返回空列表"""
+    try:
+        import warnings
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", category=FutureWarning)
+            import pynvml
+        pynvml.nvmlInit()
+    except Exception:
+        return []
+    try:
+        names = []
+        for i in range(pynvml.nvmlDeviceGetCount()):
+            name = pynvml.nvmlDeviceGetName(pynvml.nvmlDeviceGetHandleByIndex(i))
+            if isinstance(name, bytes):
+                name = name.decode('utf-8', errors='ignore')
+            names.append(name)
+        return names
+    except Exception:
+        return []
+    finally:
+        try:
+            pynvml.nvmlShutdown()  # 引用计数式关闭，不影响 HardwareMonitor 自己的 nvmlInit
+        except Exception:
+            pass
+
+
 def get_gpu_name():
     """跨平台获取 GPU 名称"""
     import sys as _sys
@@ -826,7 +991,10 @@ def get_gpu_name():
             return "Apple GPU (Metal)"
         
         elif _sys.platform == 'win32':
-            # Windows: 优先 nvidia-smi，回退 wmic
+            # Windows: 优先 NVML（免去 nvidia-smi 进程启动），再 nvidia-smi，回退 wmic
+            names = _nvml_gpu_names()
+            if names:
+                return " & ".join(names)
             try:
                 result = subprocess.check_output(
                     "nvidia-smi -L", 
@@ -869,7 +1037,10 @@ def get_gpu_name():
             return "Unknown GPU (Windows)"
         
         else:
-            # Linux: 优先 nvidia-smi，回退 lspci
+            # Linux: 优先 NVML，再 nvidia-smi，回退 lspci
+            names = _nvml_gpu_names()
+            if names:
+                return names[0]
             try:
                 result = subprocess.run(
                     ['nvidia-smi', '--query-gpu=name', '--format=csv,noheader'],
@@ -896,27 +1067,30 @@ def get_gpu_name():
     except Exception as e:
         return f"Unknown / CPU (Error: {str(e)})"
 
+# 文件名识别表（按优先级排列，第一个命中者生效）
+_MURASAKI_NAME_TOKENS = ("Murasaki", "ACGN", "Step150")
+_MODEL_PARAM_TOKENS = (("8b", "8B"), ("72b", "72B"))
+_MODEL_QUANT_TOKENS = (("q4_k_m", "Q4_K_M"), ("q8_0", "Q8_0"), ("fp16", "FP16"))
+
+
+def _match_filename_token(lower_name: str, table: tuple) -> str:
+    """按表顺序返回第一个出现在文件名中的标记对应的名称"""
+    return next((label for token, label in table if token in lower_name), "Unknown")
+
+
 def format_model_info(model_path: str):
     filename = os.path.basename(model_path)
     
     # Custom Override for Murasaki model
     display_name = filename
-    params = "Unknown"
-    quant = "Unknown"
-    
-    if "Murasaki" in filename or "ACGN" in filename or "Step150" in filename:
+    if any(token in filename for token in _MURASAKI_NAME_TOKENS):
         display_name = "Murasaki-8B-v0.1"
     
     # Extract details from filename (standard GGUF naming convention: Name-Size-Quant.gguf)
-    lower_name = filename.lower()
-    
     # Rough parsing
-    if "8b" in lower_name: params = "8B"
-    elif "72b" in lower_name: params = "72B"
-    
-    if "q4_k_m" in lower_name: quant = "Q4_K_M"
-    elif "q8_0" in lower_name: quant = "Q8_0"
-    elif "fp16" in lower_name: quant = "FP16"
+    lower_name = filename.lower()
+    params = _match_filename_token(lower_name, _MODEL_PARAM_TOKENS)
+    quant = _match_filename_token(lower_name, _MODEL_QUANT_TOKENS)
     
     return display_name, params, quant
 
@@ -1576,6 +1750,8 @@ def main():
     
     prompt_builder = PromptBuilder(glossary)
     response_parser = ResponseParser()
+    # 术语表在整个任务中不变，质量检查器只需构建一次，供所有块共享
+    quality_checker = QualityChecker(glossary=glossary)
     
 
     
@@ -1685,7 +1861,8 @@ def main():
     print(f"Loaded {len(post_processor.rules)} post-processing rules.")
 
     try:
-        engine.start_server()
+        # 模型加载与文档读取/切分并行进行，开始翻译前再等待服务就绪
+        wait_for_server, cancel_server_start = _start_server_in_background(engine)
         
         
         if args.alignment_mode and input_path.lower().endswith('.txt'):
@@ -1694,6 +1871,7 @@ def main():
             # Use normal chunker for context!
             blocks = chunker.process(items)
             print(f"[Alignment Mode] Tagged lines merged into {len(blocks)} context blocks.")
+            _, source_chars = scan_lines(i['text'] for i in items)
             doc = None # Not used here
         else:
             doc = DocumentFactory.get_document(input_path)
@@ -1708,15 +1886,15 @@ def main():
             
             # Source Lines Calculation (for Novel/Chunk mode)
             # For Alignment Mode, source_lines is already exact physical count needed for reconstruction
-            source_lines = len([i for i in items if i['text'].strip()])
+            source_lines, source_chars = scan_lines(i['text'] for i in items)
             structure_map = {} # Not used
             
             # Chunking
             blocks = chunker.process(items)
             print(f"[{args.mode.upper()} Mode] Input split into {len(blocks)} blocks.")
         
-        # Helper for printing stats (Alignment mode has already calculated exact source lines)
-        source_chars = sum(len(i['text']) for i in items if i['text'].strip())
+        # Stats: source_chars is computed with source_lines above in a single pass
+        # (Alignment mode has already calculated exact source lines)
         
         # Debug output (only when --debug is enabled)
         if args.debug:
@@ -1724,6 +1902,8 @@ def main():
             for bi, blk in enumerate(blocks):
                 print(f"[DEBUG] Block {bi+1}: {len(blk.prompt_text)} chars")
         
+        wait_for_server()
+        
         # Streaming Processing
         start_time = time.time() # Ensure initialized early
         total_chars = 0
@@ -1824,6 +2004,8 @@ def main():
         
         # Init Monitor
         monitor = HardwareMonitor()
+        # 所有块完成后通知监控线程退出，不再在收尾阶段轮询 GPU/metrics
+        monitor_stop = threading.Event()
         if monitor.enabled:
             print(f"Hardware Monitor Active: {monitor.name}")
             # Emit an initial snapshot so GUI updates immediately
@@ -1861,7 +2043,7 @@ def main():
                 
                 last_check_time = time.time()
                 
-                while True:
+                while not monitor_stop.is_set():
                     # Get Hardware Status (VRAM/GPU)
                     status = monitor.get_status() or {}
                     
@@ -1894,9 +2076,9 @@ def main():
                         # Should rarely happen
                         pass
                     
-                    if status:
+                    if status and not monitor_stop.is_set():
                         safe_print_json("JSON_MONITOR", status)
-                    time.sleep(0.5) # Fast update for smooth charts
+                    monitor_stop.wait(0.5) # Fast update for smooth charts
             
             monitor_thread = threading.Thread(target=run_monitor_loop, daemon=True)
             monitor_thread.start()
@@ -1935,7 +2117,10 @@ def main():
                 return
             elif is_valid and existing_lines > 0:
                 # Pass mode to skip block calculation
-                skip_blocks_from_output = calculate_skip_blocks(blocks, existing_lines, is_chunk_mode=(args.mode == "chunk"))
+                resume_line_counts = block_line_counts(blocks)
+                skip_blocks_from_output = calculate_skip_blocks(
+                    blocks, existing_lines, is_chunk_mode=(args.mode == "chunk"), line_counts=resume_line_counts
+                )
                 if skip_blocks_from_output >= len(blocks):
                     print(f"[Resume] All {len(blocks)} blocks already translated. Nothing to do.")
                     return
@@ -1982,12 +2167,12 @@ def main():
                 print(f"[Resume] Rebuilding memory state for {skip_blocks_from_output} skipped blocks...")
                 current_line_ptr = 0
                 for idx in range(skip_blocks_from_output):
+                    block_lines_count = resume_line_counts[idx]
                     # 1. Try to find in temp progress file first (contains full metadata/cot)
                     if idx in precalculated_temp:
                          all_results[idx] = precalculated_temp[idx]
                     # 2. Extract from existing output file (requires physical line alignment)
                     elif existing_content:
-                        block_lines_count = blocks[idx].prompt_text.count('\n') + 1
                         block_lines = existing_content[current_line_ptr : current_line_ptr + block_lines_count]
                         
                         if block_lines:
@@ -2006,7 +2191,6 @@ def main():
                             print(f"[Resume] Warning: Could not find content for block {idx} in existing output.")
                     
                     # Advance pointer (account for chunk mode spacer if applicable)
-                    block_lines_count = blocks[idx].prompt_text.count('\n') + 1
                     current_line_ptr += (block_lines_count + 1) if args.mode == "chunk" else block_lines_count
                 
                 # [Fix] Synchronize skipped blocks to TranslationCache to prevent data loss on final save
@@ -2054,15 +2238,15 @@ def main():
         
         # Prepare Temp Output File (Append or Create)
         temp_file_mode = 'a' if (args.resume and len(precalculated_temp) > 0 and resume_config_matched) else 'w'
-        temp_progress_file = open(temp_progress_path, temp_file_mode, encoding='utf-8', buffering=1)
+        temp_progress_file = open(temp_progress_path, temp_file_mode, encoding='utf-8', buffering=_STREAM_BUFFER_SIZE)
         
         # If starting fresh, write fingerprint
         if temp_file_mode == 'w':
             temp_progress_file.write(json.dumps({"type": "fingerprint", "hash": config_hash}) + "\n")
             temp_progress_file.flush()
         
-        cot_context = open(cot_path, 'w', encoding='utf-8', buffering=1) if args.save_cot else nullcontext()
-        with open(actual_output_path, output_mode, encoding='utf-8', buffering=1) as f_out, \
+        cot_context = open(cot_path, 'w', encoding='utf-8', buffering=_STREAM_BUFFER_SIZE) if args.save_cot else nullcontext()
+        with open(actual_output_path, output_mode, encoding='utf-8', buffering=_STREAM_BUFFER_SIZE) as f_out, \
              cot_context as f_cot:
 
             # Write kept content immediately if resuming
@@ -2070,6 +2254,8 @@ def main():
                 f_out.write(keep_content_str)
                 f_out.flush()
             
+            pause_file = output_path + ".pause"
+            
             # ========================================
             # Parallel Worker Function
             # ========================================
@@ -2095,9 +2281,7 @@ def main():
 
                 try:
                     # Pause Check (Worker level sleeping)
-                    pause_file = output_path + ".pause"
-                    while os.path.exists(pause_file):
-                         time.sleep(1)
+                    wait_while_paused(pause_file)
                     
                     # Pre-processing using Unified RuleProcessor
                     logger.debug(f"[Block {block_idx+1}] Pre-processing start (len: {len(block.prompt_text)})")
@@ -2141,7 +2325,8 @@ def main():
                         glossary=glossary,
                         stdout_lock=stdout_lock,
                         strict_mode=strict_mode,
-                        protector=local_protector
+                        protector=local_protector,
+                        quality_checker=quality_checker
                     )
 
 
@@ -2224,14 +2409,19 @@ def main():
             # Note: EPUB/SRT reconstruction handled by memory rebuild logic above (skip_blocks_from_output)
             
             # --- Execution Status Initialization ---
+            # 动态分隔符：如果后处理规则包含 ensure_double_newline，则 block 间使用双换行（整次运行不变）
+            output_block_separator = "\n\n" if (use_double_newline_separator or args.mode == "chunk") else "\n"
             results_buffer = {}
             preview_sent = set()
             next_write_idx = skip_blocks_from_output
             
             # 统计修正：过滤掉空块（用于负载均衡的占位块）
-            effective_blocks_indices = [idx for idx, b in enumerate(blocks) if b.prompt_text.strip()]
+            # 每块是否非空只判定一次，完成回调中按下标查表，不再对每个结果的原文做 strip
+            block_is_effective = [bool(b.prompt_text) and not b.prompt_text.isspace() for b in blocks]
             total_tasks_count = len(future_to_index)
-            effective_total = len(effective_blocks_indices)
+            effective_total = sum(block_is_effective)
+            # 续翻跳过的非空块数在循环中不变，只统计一次
+            skipped_effective = sum(block_is_effective[:skip_blocks_from_output])
             completed_count = 0 
             effective_completed = 0
             
@@ -2257,7 +2447,7 @@ def main():
                     # Store results in buffer for ordered processing
                     results_buffer[block_idx] = result
                     completed_count += 1
-                    if result["src_text"].strip():
+                    if block_is_effective[block_idx]:
                         effective_completed += 1
                         
                     # Stats processing
@@ -2288,7 +2478,7 @@ def main():
                         
                         block_src_text = result["src_text"]
                         total_source_chars += len(block_src_text)
-                        total_source_lines += len([l for l in block_src_text.splitlines() if l.strip()])
+                        total_source_lines += count_nonempty_lines(block_src_text.splitlines())
                         
                         # Emit preview as soon as a block finishes (out-of-order allowed)
                         if block_idx not in preview_sent:
@@ -2307,28 +2497,27 @@ def main():
                             )
                             preview_sent.add(block_idx)
                         
-                        # Progress reporting
-                        elapsed_so_far = max(0.1, time.time() - start_time)
-                        
-                        # Speed Calculation uses SESSION stats only
-                        current_speed_chars = session_out_chars / elapsed_so_far
-                        
-                        avg_time_per_block = elapsed_so_far / max(1, completed_count)
-                        remaining_time = (total_tasks_count - completed_count) * avg_time_per_block
-                        
-                        progress_data = {
-                            "current": effective_completed + len([idx for idx in range(skip_blocks_from_output) if blocks[idx].prompt_text.strip()]),
-                            "ordered_current": next_write_idx, "total": effective_total,
-                            "percent": ((effective_completed + len([idx for idx in range(skip_blocks_from_output) if blocks[idx].prompt_text.strip()])) / max(1, effective_total)) * 100,
-                            "total_chars": total_out_chars, "total_lines": total_lines,
-                            "source_chars": total_source_chars, "source_lines": total_source_lines, 
-                            "speed_chars": round(current_speed_chars, 1), "speed_lines": round(session_out_lines / elapsed_so_far, 2),
-                            "speed_gen": round(total_gen_tokens / elapsed_so_far, 1), "speed_eval": round(total_prompt_tokens / elapsed_so_far, 1),
-                            "total_tokens": total_gen_tokens, "elapsed": elapsed_so_far, "remaining": int(remaining_time)
-                        }
-                        
+                        # Progress reporting（限频 0.1s；被限频时不必构造进度数据）
                         now = time.time()
                         if (now - last_progress_time > 0.1) or (completed_count == total_tasks_count):
+                            elapsed_so_far = max(0.1, now - start_time)
+                            
+                            # Speed Calculation uses SESSION stats only
+                            current_speed_chars = session_out_chars / elapsed_so_far
+                            
+                            avg_time_per_block = elapsed_so_far / max(1, completed_count)
+                            remaining_time = (total_tasks_count - completed_count) * avg_time_per_block
+                            
+                            progress_data = {
+                                "current": effective_completed + skipped_effective,
+                                "ordered_current": next_write_idx, "total": effective_total,
+                                "percent": ((effective_completed + skipped_effective) / max(1, effective_total)) * 100,
+                                "total_chars": total_out_chars, "total_lines": total_lines,
+                                "source_chars": total_source_chars, "source_lines": total_source_lines, 
+                                "speed_chars": round(current_speed_chars, 1), "speed_lines": round(session_out_lines / elapsed_so_far, 2),
+                                "speed_gen": round(total_gen_tokens / elapsed_so_far, 1), "speed_eval": round(total_prompt_tokens / elapsed_so_far, 1),
+                                "total_tokens": total_gen_tokens, "elapsed": elapsed_so_far, "remaining": int(remaining_time)
+                            }
                             safe_print_json("JSON_PROGRESS", progress_data)
                             last_progress_time = now
 
@@ -2363,40 +2552,46 @@ def main():
                                 except Exception:
                                     last_retry_type = None
                             if warnings_list:
-                                for warning in warnings_list:
-                                    if isinstance(warning, dict):
-                                        safe_print_json(
-                                            "JSON_WARNING",
-                                            {
-                                                "block": curr_disp,
-                                                "line": warning.get("line"),
-                                                "type": warning.get("type"),
-                                                "message": warning.get("message", ""),
-                                                "retry_count": len(retry_history),
-                                                "last_retry_type": last_retry_type,
-                                            },
-                                        )
+                                # 同一块的警告合并为一次写入/flush
+                                safe_print_json_batch(
+                                    "JSON_WARNING",
+                                    [
+                                        {
+                                            "block": curr_disp,
+                                            "line": warning.get("line"),
+                                            "type": warning.get("type"),
+                                            "message": warning.get("message", ""),
+                                            "retry_count": len(retry_history),
+                                            "last_retry_type": last_retry_type,
+                                        }
+                                        for warning in warnings_list
+                                        if isinstance(warning, dict)
+                                    ],
+                                )
                             
                             if translation_cache:
-                                w_types = [w['type'] for w in res["warnings"]] if res["warnings"] else []
+                                w_types = [w['type'] for w in warnings_list]
                                 translation_cache.add_block(next_write_idx, res["src_text"], res["preview_text"], w_types, res["cot"], res.get("retry_history", []))
                             
-                            # Write to txt stream
-                            # 动态分隔符：如果后处理规则包含 ensure_double_newline，则 block 间使用双换行
-                            block_separator = "\n\n" if (use_double_newline_separator or args.mode == "chunk") else "\n"
-                            f_out.write(res["out_text"] + block_separator)
+                            # Write to txt stream（分别写入缓冲区，不为拼接分隔符复制整块译文）
+                            f_out.write(res["out_text"])
+                            f_out.write(output_block_separator)
                             
                             if args.save_cot and res["cot"]:
                                 f_cot.write(f"[MURASAKI] ========== Block {curr_disp} ==========\n{res['raw_output']}\n\n")
                         else:
                             f_out.write(f"\n[Block {curr_disp} Failed]\n")
                         
-                        f_out.flush()
                         # CRITICAL: Store in all_results for post-processing reconstruction
                         all_results[next_write_idx] = res
                         next_write_idx += 1
+                        if next_write_idx % _OUTPUT_FLUSH_INTERVAL == 0:
+                            f_out.flush()
+                            if f_cot is not None:
+                                f_cot.flush()
 
             executor.shutdown(wait=True)
+        monitor_stop.set()
         
         # [Final Structured Save] 
         # 此操作在 f_out 关闭后执行，确保所有文本已落盘
@@ -2555,10 +2750,17 @@ def main():
         traceback.print_exc()
         sys.exit(1)
     finally:
+        if 'monitor_stop' in locals():
+            monitor_stop.set()
+        if 'monitor' in locals():
+            monitor.close()  # 结束常驻的 powermetrics 采样进程（macOS）
         if 'temp_progress_file' in locals():
             try:
                 temp_progress_file.close()
             except: pass
+        if 'cancel_server_start' in locals():
+            # 文档读取/切分出错时启动线程可能仍在运行，先让其结束，避免清理后才拉起的服务进程残留
+            cancel_server_start()
         if engine:
             engine.stop_server()
 
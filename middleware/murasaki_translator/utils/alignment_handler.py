@@ -40,13 +40,13 @@ class AlignmentHandler:
         
         try:
             with open(input_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                total_physical_lines = len(lines)
-                
+                # Iterate the file object directly: only the tagged items are kept,
+                # not a second full list of raw input lines.
+                phys_idx = -1
                 logical_id = 1
-                for phys_idx, line in enumerate(lines):
+                for phys_idx, line in enumerate(f):
                     content = line.rstrip('\r\n')
-                    if not content.strip():
+                    if not content or content.isspace():
                         continue 
                         
                     # Structure Map: Record where this logical ID belongs in the physical file
@@ -58,6 +58,7 @@ class AlignmentHandler:
                     items.append({'text': tagged_text, 'meta': 'alignment_structural'})
                     
                     logical_id += 1
+                total_physical_lines = phys_idx + 1
                         
             logger.info(f"Tagged {len(items)} logical lines. Map size: {len(structure_map)}")
             return items, structure_map, total_physical_lines
@@ -73,7 +74,10 @@ class AlignmentHandler:
         - Enforces single-line output for cleaner preview.
         """
         # 1. Remove ID markers (Start and End)
-        out = re.sub(AlignmentHandler.TAG_MARKER_PATTERN, '', text).strip()
+        # Markers always contain '@'; skip the regex pass entirely when there is none
+        if '@' not in text:
+            return text.strip()
+        out = AlignmentHandler.TAG_MARKER_PATTERN.sub('', text).strip()
         
         # 2. Enforce Single Line for Preview? NO.
         # In Alignment Mode (Chunking), a block contains multiple lines.
@@ -202,10 +206,10 @@ class AlignmentHandler:
             else:
                 logger.warning(f"[Reconstruct] Physical index {phys_idx} out of bounds (Max: {total_physical_lines})")
 
-        # 4. Save
+        # 4. Save (one write for the whole canvas instead of one per physical line)
         with open(output_path, 'w', encoding='utf-8') as f:
-            for line in physical_lines:
-                f.write(line + "\n")
+            if physical_lines:
+                f.write("\n".join(physical_lines) + "\n")
         
         logger.info(f"Reconstruction fulfilled {filled_count}/{len(structure_map)} logical items into {total_physical_lines} physical lines.")
 
@@ -227,6 +231,11 @@ class AlignmentHandler:
             content = _clean_content(match.group('content'))
             logical_map[log_id] = content
 
+        # The loose pass only fills IDs the strict pass missed; when every expected ID
+        # is already resolved it cannot add anything, so skip the second scan of the stream.
+        if expected_set is not None and len(logical_map) == len(expected_set):
+            return logical_map
+
         for match in AlignmentHandler._LOOSE_PAIR_PATTERN.finditer(text):
             log_id = int(match.group('id'))
             if expected_set is not None and log_id not in expected_set:
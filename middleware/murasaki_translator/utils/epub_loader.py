@@ -3,6 +3,7 @@
 import os
 import warnings
 import logging
+from typing import Iterator
 
 try:
     import ebooklib
@@ -17,11 +18,21 @@ warnings.filterwarnings('ignore')
 
 logger = logging.getLogger(__name__)
 
+# A paragraph ending with one of these closes the merge buffer (all single characters)
+_TERMINATORS = frozenset('。」』！？…—.!?")）}]')
+
 def extract_text_from_epub(epub_path: str) -> list[str]:
     """
     Extracts text from EPUB chapters and returns a list of lines.
     Handles Ruby text (removes furigana) and merges broken lines within paragraphs.
     """
+    return list(iter_text_from_epub(epub_path))
+
+def iter_text_from_epub(epub_path: str) -> Iterator[str]:
+    """
+    Same as extract_text_from_epub, but yields lines chapter by chapter so callers
+    writing them out never hold the whole book's text at once.
+    """
     if not HAS_EPUB_DEPS:
         raise ImportError("Missing dependencies for EPUB support. Please install: pip install EbookLib beautifulsoup4")
 
@@ -30,8 +41,6 @@ def extract_text_from_epub(epub_path: str) -> list[str]:
 
     logger.info(f"Loading EPUB: {epub_path}")
     book = epub.read_epub(epub_path)
-    
-    all_lines = []
 
     for item in book.get_items():
         if item.get_type() == ebooklib.ITEM_DOCUMENT:
@@ -43,8 +52,9 @@ def extract_text_from_epub(epub_path: str) -> list[str]:
                 continue
             
             # 1. Remove Ruby text (Furigana)
-            for ruby in soup.find_all('ruby'):
-                for tag in ruby.find_all(['rt', 'rp']):
+            # One pass over rt/rp instead of a nested search under every <ruby>
+            for tag in soup.find_all(['rt', 'rp']):
+                if tag.find_parent('ruby') is not None:
                     tag.decompose()
 
             # 2. Extract text
@@ -52,7 +62,7 @@ def extract_text_from_epub(epub_path: str) -> list[str]:
             
             if blocks:
                 # Add chapter separator
-                # all_lines.append(f"===== {item.get_name()} =====\n")
+                # yield f"===== {item.get_name()} =====\n"
                 
                 buffer = ""
                 for block in blocks:
@@ -65,16 +75,15 @@ def extract_text_from_epub(epub_path: str) -> list[str]:
                     # Headers: Flush buffer and write immediately
                     if block.name.startswith('h'):
                         if buffer:
-                            all_lines.append(buffer + "\n")
+                            yield buffer + "\n"
                             buffer = ""
-                        all_lines.append(clean_text + "\n")
+                        yield clean_text + "\n"
                         continue
 
                     # Paragraphs: Buffer logic for sentence merging
                     if buffer:
-                        terminators = ('。', '」', '』', '！', '？', '…', '—', '.', '!', '?', '"', ')', '）', '}', ']')
-                        if buffer.endswith(terminators):
-                            all_lines.append(buffer + "\n")
+                        if buffer[-1] in _TERMINATORS:
+                            yield buffer + "\n"
                             buffer = clean_text
                         else:
                             buffer += clean_text
@@ -82,12 +91,11 @@ def extract_text_from_epub(epub_path: str) -> list[str]:
                         buffer = clean_text
                 
                 if buffer:
-                    all_lines.append(buffer + "\n")
+                    yield buffer + "\n"
             else:
                 # Fallback
                 text = soup.get_text(separator='\n')
-                lines = [line.strip() for line in text.splitlines() if line.strip()]
-                for line in lines:
-                    all_lines.append(line + "\n")
-
-    return all_lines
+                for line in text.splitlines():
+                    line = line.strip()
+                    if line:
+                        yield line + "\n"
@@ -4,7 +4,14 @@
 算法：基于汉字 Jaccard 相似度的贪婪匹配
 """
 import re
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
+
+
+def _compile_hanzi_pattern(ranges: Iterable[Tuple[int, int]]) -> "re.Pattern[str]":
+    """把汉字码位范围编译为单一字符类正则"""
+    return re.compile(
+        "[" + "".join(f"\\U{start:08X}-\\U{end:08X}" for start, end in ranges) + "]"
+    )
 
 
 class LineAligner:
@@ -17,18 +24,19 @@ class LineAligner:
         (0x20000, 0x2A6DF),  # CJK 扩展 B
         (0xF900, 0xFAFF),    # CJK 兼容汉字
     ]
+
+    # 由 CJK_RANGES 编译的单一字符类正则（导入时编译一次，子类覆盖范围时重新编译）
+    _HANZI_RE = _compile_hanzi_pattern(CJK_RANGES)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._HANZI_RE = _compile_hanzi_pattern(cls.CJK_RANGES)
     
     @classmethod
     def extract_hanzi(cls, text: str) -> set:
         """提取文本中的汉字集合"""
-        hanzi = set()
-        for char in text:
-            code = ord(char)
-            for start, end in cls.CJK_RANGES:
-                if start <= code <= end:
-                    hanzi.add(char)
-                    break
-        return hanzi
+        # 由正则引擎一次扫描完成范围判断，不再逐字符遍历各个范围
+        return set(cls._HANZI_RE.findall(text))
     
     @classmethod
     def jaccard_similarity(cls, set_a: set, set_b: set) -> float:
@@ -56,9 +64,9 @@ class LineAligner:
         - 原文多于译文：多个原文行对应同一个译文行
         - 译文多于原文：多个译文行对应同一个原文行
         """
-        # 过滤空行
-        src_lines = [l.strip() for l in src_lines if l.strip()]
-        dst_lines = [l.strip() for l in dst_lines if l.strip()]
+        # 过滤空行（每行只 strip 一次）
+        src_lines = [l for l in map(str.strip, src_lines) if l]
+        dst_lines = [l for l in map(str.strip, dst_lines) if l]
         
         # Guard: 空列表检查，防止除零错误
         if not src_lines and not dst_lines:
@@ -74,29 +82,24 @@ class LineAligner:
         if len(src_lines) == len(dst_lines):
             return list(zip(src_lines, dst_lines))
         
-        # 行数不等，使用汉字相似度匹配
+        # 行数不等，按比例分配（分配结果与汉字特征无关，无需提取）
         result = []
         
-        # 提取所有汉字特征
-        src_hanzi = [cls.extract_hanzi(line) for line in src_lines]
-        dst_hanzi = [cls.extract_hanzi(line) for line in dst_lines]
-        
-        if len(src_lines) > len(dst_lines):
+        # 比例分配用整数运算：idx = i * 少的一侧 // 多的一侧，结果精确且必然小于少的一侧，
+        # 不会出现浮点比值 int(i / ratio) 在整除边界上少算一位的误差
+        n_src, n_dst = len(src_lines), len(dst_lines)
+        if n_src > n_dst:
             # 原文多于译文：多个原文对应一个译文
             # 使用比例分配而非贪婪匹配，避免同一译文重复使用
             # 策略：按比例将 dst_lines 分配到 src_lines
-            ratio = len(src_lines) / len(dst_lines)
             for i, src_line in enumerate(src_lines):
                 # 计算当前 src 行应对应的 dst 索引
-                dst_idx = min(int(i / ratio), len(dst_lines) - 1)
-                result.append((src_line, dst_lines[dst_idx]))
+                result.append((src_line, dst_lines[i * n_dst // n_src]))
         else:
             # 译文多于原文：多个译文合并到对应的原文
             # 策略：按比例将 src_lines 分配到 dst_lines
-            ratio = len(dst_lines) / len(src_lines)
             for j, dst_line in enumerate(dst_lines):
-                src_idx = min(int(j / ratio), len(src_lines) - 1)
-                result.append((src_lines[src_idx], dst_line))
+                result.append((src_lines[j * n_src // n_dst], dst_line))
         
         return result
     
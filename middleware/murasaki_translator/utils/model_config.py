@@ -69,19 +69,24 @@ PARAMS_PATTERNS = [
 # 版本识别模式  
 VERSION_PATTERN = r'[_-]v(\d+\.?\d*)'
 
+# 预编译各识别模式（量化模式仍按列表优先级逐条尝试）
+_QUANT_COMPILED = [(re.compile(pattern, re.IGNORECASE), quant_type) for pattern, quant_type in QUANT_PATTERNS]
+_PARAMS_COMPILED = [(re.compile(pattern, re.IGNORECASE), formatter) for pattern, formatter in PARAMS_PATTERNS]
+_VERSION_RE = re.compile(VERSION_PATTERN, re.IGNORECASE)
+
 
 def detect_quant_type(filename: str) -> str:
     """从文件名检测量化类型"""
-    for pattern, quant_type in QUANT_PATTERNS:
-        if re.search(pattern, filename, re.IGNORECASE):
+    for pattern, quant_type in _QUANT_COMPILED:
+        if pattern.search(filename):
             return quant_type
     return "Unknown"
 
 
 def detect_params(filename: str) -> str:
     """从文件名检测参数量"""
-    for pattern, formatter in PARAMS_PATTERNS:
-        match = re.search(pattern, filename, re.IGNORECASE)
+    for pattern, formatter in _PARAMS_COMPILED:
+        match = pattern.search(filename)
         if match:
             return formatter(match)
     return "Unknown"
@@ -89,7 +94,7 @@ def detect_params(filename: str) -> str:
 
 def detect_version(filename: str) -> str:
     """从文件名检测版本号"""
-    match = re.search(VERSION_PATTERN, filename, re.IGNORECASE)
+    match = _VERSION_RE.search(filename)
     if match:
         return f"v{match.group(1)}"
     return ""
@@ -1,13 +1,37 @@
 """
 跨平台硬件监控模块
-支持 NVIDIA (pynvml), macOS (ioreg), AMD (amd-smi)
+支持 NVIDIA (pynvml), macOS (ioreg), AMD (amdsmi / amd-smi)
 """
+import os
 import sys
 import subprocess
+import threading
 import time
 import re
 import json
 
+# 依赖子进程采样的后端（macOS/AMD/generic）状态缓存时长（秒），可用环境变量覆盖
+DEFAULT_POLL_INTERVAL_SECONDS = 2.0
+POLL_INTERVAL_ENV = "GPU_POLL_INTERVAL_SECONDS"
+
+# 每次采样都要 fork 外部命令的后端；NVIDIA 走进程内的 NVML，调用开销很小，不缓存
+_SUBPROCESS_BACKENDS = frozenset(('macos', 'amd', 'generic'))
+
+# 常驻 powermetrics 的采样间隔（毫秒）、首帧等待时长与关闭时等待退出的时长（秒）
+POWERMETRICS_INTERVAL_MS = 1000
+_POWERMETRICS_FIRST_FRAME_TIMEOUT = 2.0
+_POWERMETRICS_STOP_TIMEOUT = 2.0
+
+
+def _poll_interval_from_env() -> float:
+    raw = os.environ.get(POLL_INTERVAL_ENV, "").strip()
+    if not raw:
+        return DEFAULT_POLL_INTERVAL_SECONDS
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return DEFAULT_POLL_INTERVAL_SECONDS
+
 
 class HardwareMonitor:
     """跨平台 GPU 监控器"""
@@ -19,8 +43,20 @@ class HardwareMonitor:
         self.name = "Unknown GPU"
         self._pynvml = None
         self._handle = None
+        self._amdsmi = None  # AMD 进程内绑定（可选）；不可用时回退到 amd-smi 命令行
+        self._amd_handle = None
         self._generic_vram_total_gb = 0.0
         self._generic_unified_memory = False
+        self._total_ram_gb = None  # 物理内存总量运行期间不变，首次成功读取后缓存
+        # get_status 结果缓存：(monotonic 时间戳, 状态)，仅用于子进程采样的后端
+        self._status_ttl = _poll_interval_from_env()
+        self._status_cache = None
+        # 常驻 powermetrics 进程（macOS）：后台线程持续解析 plist 帧，采样只读取最近一次结果
+        self._pm_proc = None
+        self._pm_reader = None
+        self._pm_unavailable = False
+        self._pm_gpu_util = -1
+        self._pm_ready = threading.Event()
 
         self._init_backend()
     
@@ -81,7 +117,9 @@ class HardwareMonitor:
             print(f"[HardwareMonitor] macOS init failed: {e}")
     
     def _init_amd(self):
-        """初始化 AMD 后端 (amd-smi)"""
+        """初始化 AMD 后端（优先 amdsmi Python 绑定，回退 amd-smi 命令行）"""
+        if self._init_amdsmi():
+            return True
         try:
             result = subprocess.run(
                 ['amd-smi', 'static', '--json'],
@@ -103,6 +141,33 @@ class HardwareMonitor:
             print(f"[HardwareMonitor] AMD init failed: {e}")
         return False
 
+    def _init_amdsmi(self) -> bool:
+        """初始化 AMD 进程内绑定 (amdsmi)，与 pynvml 相同，采样无需 fork 子进程"""
+        try:
+            import amdsmi
+        except ImportError:
+            return False
+        try:
+            amdsmi.amdsmi_init()
+            handles = amdsmi.amdsmi_get_processor_handles()
+            if self.gpu_index >= len(handles):
+                amdsmi.amdsmi_shut_down()
+                return False
+            handle = handles[self.gpu_index]
+            try:
+                name = amdsmi.amdsmi_get_gpu_asic_info(handle).get('market_name') or 'AMD GPU'
+            except Exception:
+                name = 'AMD GPU'
+            self._amdsmi = amdsmi
+            self._amd_handle = handle
+            self.name = name
+            self.backend = 'amd'
+            self.enabled = True
+            return True
+        except Exception as e:
+            print(f"[HardwareMonitor] amdsmi init failed: {e}")
+        return False
+
     @staticmethod
     def _parse_bytes_to_gb(raw_value):
         if raw_value is None:
@@ -204,7 +269,22 @@ class HardwareMonitor:
         """获取 GPU 状态"""
         if not self.enabled:
             return None
-        
+
+        if self.backend not in _SUBPROCESS_BACKENDS or self._amdsmi is not None:
+            return self._get_backend_status()
+
+        # 轮询间隔内直接复用上次结果，避免每次都 fork vm_stat/powermetrics/amd-smi；
+        # 调用方会往返回的字典里合并其他指标，因此每次都返回副本
+        now = time.monotonic()
+        cached = self._status_cache
+        if cached is None or now - cached[0] >= self._status_ttl:
+            cached = (now, self._get_backend_status())
+            self._status_cache = cached
+        status = cached[1]
+        return dict(status) if status is not None else None
+
+    def _get_backend_status(self):
+        """按后端实际采样一次 GPU 状态"""
         if self.backend == 'nvidia':
             return self._get_nvidia_status()
         elif self.backend == 'macos':
@@ -234,6 +314,16 @@ class HardwareMonitor:
         }
 
     def _get_system_ram_gb(self):
+        if self._total_ram_gb is not None:
+            return self._total_ram_gb
+        total_gb = self._read_system_ram_gb()
+        if total_gb is None:
+            return 8.0
+        self._total_ram_gb = total_gb
+        return total_gb
+
+    def _read_system_ram_gb(self):
+        """读取 Windows/Linux 物理内存总量（GB），失败返回 None"""
         try:
             if sys.platform == 'win32':
                 result = subprocess.run(
@@ -258,7 +348,7 @@ class HardwareMonitor:
                                 return int(parts[1]) / (1024**2)
         except Exception:
             pass
-        return 8.0
+        return None
     
     def _get_nvidia_status(self):
         """获取 NVIDIA GPU 状态"""
@@ -339,12 +429,18 @@ class HardwareMonitor:
 
     def _get_gpu_util_powermetrics(self):
         """
-        尝试通过 powermetrics 获取 GPU 使用率（需要 sudo）
-        使用 plist 格式输出，解析更可靠
+        通过常驻的 powermetrics 进程获取 GPU 使用率（需要 sudo）
+        首次调用时检查免密 sudo 并启动进程，之后只读取后台线程解析出的最新值
 
         Returns:
             float: GPU 使用率百分比 (0-100)，失败或无权限返回 -1
         """
+        if self._pm_proc is None and not self._pm_unavailable:
+            self._start_powermetrics()
+        return self._pm_gpu_util
+
+    def _start_powermetrics(self):
+        """检查 powermetrics 免密 sudo 权限，启动按固定间隔输出 plist 的常驻进程"""
         try:
             # 测试是否有 powermetrics 的免密 sudo 权限
             test = subprocess.run(
@@ -353,45 +449,99 @@ class HardwareMonitor:
                 timeout=2
             )
             if test.returncode != 0:
-                return -1  # 无 sudo 权限
+                self._pm_unavailable = True  # 无 sudo 权限
+                return
 
-            # 运行 powermetrics，使用 plist 格式输出
-            result = subprocess.run(
-                ['sudo', '-n', 'powermetrics', '--samplers', 'gpu_power', '-i', '500', '-n', '1', '-f', 'plist'],
-                capture_output=True,
-                text=True,
-                timeout=5
+            self._pm_proc = subprocess.Popen(
+                ['sudo', '-n', 'powermetrics', '--samplers', 'gpu_power',
+                 '-i', str(POWERMETRICS_INTERVAL_MS), '-f', 'plist'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
             )
+        except Exception:
+            self._pm_unavailable = True
+            return
 
-            if result.returncode == 0:
-                import plistlib
-                data = plistlib.loads(result.stdout.encode('utf-8'))
-                gpu = data.get('gpu', {})
-                idle_ratio = gpu.get('idle_ratio', 1.0)
-                active_percent = (1.0 - idle_ratio) * 100
-                return round(active_percent, 1)
+        self._pm_reader = threading.Thread(
+            target=self._read_powermetrics,
+            args=(self._pm_proc.stdout,),
+            name="powermetrics-reader",
+            daemon=True,
+        )
+        self._pm_reader.start()
+        # 只在首次启动时短暂等待第一帧，使首个状态即带有真实使用率
+        self._pm_ready.wait(_POWERMETRICS_FIRST_FRAME_TIMEOUT)
+
+    def _read_powermetrics(self, stream):
+        """
+        后台线程：逐行读取 powermetrics 输出，遇到 </plist> 即解析一帧
+        （帧之间以 NUL 分隔）。进程退出后使用率回到 -1。
+        """
+        frame = []
+        try:
+            for line in iter(stream.readline, b''):
+                frame.append(line)
+                if b'</plist>' not in line:
+                    continue
+                payload = b''.join(frame).strip(b'\x00 \t\r\n')
+                frame = []
+                try:
+                    self._pm_gpu_util = self._gpu_util_from_plist(payload)
+                except Exception:
+                    pass
+                self._pm_ready.set()
         except Exception:
             pass
+        finally:
+            self._pm_gpu_util = -1
+            self._pm_unavailable = True
+            self._pm_ready.set()
 
-        return -1
+    @staticmethod
+    def _gpu_util_from_plist(payload: bytes) -> float:
+        """从一帧 powermetrics plist 中计算 GPU 使用率"""
+        import plistlib
+        data = plistlib.loads(payload)
+        gpu = data.get('gpu', {})
+        idle_ratio = gpu.get('idle_ratio', 1.0)
+        active_percent = (1.0 - idle_ratio) * 100
+        return round(active_percent, 1)
     
+    @staticmethod
+    def _sysconf_total_ram_gb():
+        """通过 sysconf 读取物理内存总量（macOS/Linux 均支持，无需 fork），失败返回 None"""
+        try:
+            total = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+        except (AttributeError, ValueError, OSError):
+            return None
+        return total / (1024**3) if total > 0 else None
+
     def _get_macos_total_ram(self):
         """获取 macOS 总内存"""
-        try:
-            result = subprocess.run(
-                ['sysctl', '-n', 'hw.memsize'],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-            if result.returncode == 0:
-                return int(result.stdout.strip()) / (1024**3)
-        except Exception:
-            pass
-        return 8.0
+        if self._total_ram_gb is not None:
+            return self._total_ram_gb
+        total_gb = self._sysconf_total_ram_gb()
+        if total_gb is None:
+            try:
+                result = subprocess.run(
+                    ['sysctl', '-n', 'hw.memsize'],
+                    capture_output=True,
+                    text=True,
+                    timeout=2
+                )
+                if result.returncode == 0:
+                    total_gb = int(result.stdout.strip()) / (1024**3)
+            except Exception:
+                pass
+        if total_gb is None:
+            return 8.0
+        self._total_ram_gb = total_gb
+        return total_gb
     
     def _get_amd_status(self):
         """获取 AMD GPU 状态"""
+        if self._amdsmi is not None:
+            return self._get_amdsmi_status()
         try:
             result = subprocess.run(
                 ['amd-smi', 'monitor', '--json'],
@@ -420,10 +570,58 @@ class HardwareMonitor:
             pass
         return None
     
+    def _get_amdsmi_status(self):
+        """通过 amdsmi 绑定获取 AMD GPU 状态（显存单位 MB，与 amd-smi 命令行一致）"""
+        try:
+            vram = self._amdsmi.amdsmi_get_gpu_vram_usage(self._amd_handle)
+            activity = self._amdsmi.amdsmi_get_gpu_activity(self._amd_handle)
+            vram_used = vram.get('vram_used', 0)
+            vram_total = vram.get('vram_total', 0)
+            gpu_util = activity.get('gfx_activity', 0)
+
+            return {
+                "name": self.name,
+                "vram_used_gb": round(vram_used / 1024, 2),
+                "vram_total_gb": round(vram_total / 1024, 2),
+                "vram_percent": round(vram_used / vram_total * 100, 1) if vram_total > 0 else 0,
+                "gpu_util": gpu_util,
+                "mem_util": round(vram_used / vram_total * 100, 1) if vram_total > 0 else 0
+            }
+        except Exception:
+            return None
+
+    def _stop_powermetrics(self):
+        """结束常驻 powermetrics 进程；之后 get_status 不再重新拉起"""
+        proc, self._pm_proc = self._pm_proc, None
+        reader, self._pm_reader = self._pm_reader, None
+        self._pm_unavailable = True
+        if proc is None:
+            return
+        # 结束进程后由读取线程读到 EOF 自行退出；不在其阻塞于 readline 时关闭管道
+        try:
+            proc.terminate()
+            proc.wait(timeout=_POWERMETRICS_STOP_TIMEOUT)
+        except Exception:
+            return  # 无权向 sudo 发信号或未及时退出：读取线程为守护线程，不阻塞关闭
+        if reader is not None:
+            reader.join(_POWERMETRICS_STOP_TIMEOUT)
+            if reader.is_alive():
+                return
+        try:
+            proc.stdout.close()
+        except Exception:
+            pass
+
     def close(self):
         """关闭监控器"""
+        self._stop_powermetrics()
         if self.backend == 'nvidia' and self._pynvml:
             try:
                 self._pynvml.nvmlShutdown()
             except Exception:
                 pass
+        if self.backend == 'amd' and self._amdsmi:
+            try:
+                self._amdsmi.amdsmi_shut_down()
+            except Exception:
+                pass
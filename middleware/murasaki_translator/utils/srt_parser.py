@@ -35,6 +35,8 @@ class SRTParser:
     TIMESTAMP_PATTERN = re.compile(
         r"(\d{2}:\d{2}:\d{2},\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2},\d{3})"
     )
+    # 块分隔（连续空行）
+    BLOCK_SEPARATOR_PATTERN = re.compile(r"\n{2,}")
 
     @classmethod
     def parse(cls, content: str) -> List[SRTEntry]:
@@ -46,29 +48,32 @@ class SRTParser:
         entries = []
         
         # 按空行分割块
-        chunks = re.split(r"\n{2,}", content.strip())
+        chunks = cls.BLOCK_SEPARATOR_PATTERN.split(content.strip())
+        timestamp_match = cls.TIMESTAMP_PATTERN.match
         
         for chunk in chunks:
-            lines = [line.strip() for line in chunk.splitlines()]
+            lines = chunk.splitlines()
             
             # 至少需要3行：序号、时间轴、文本
             if len(lines) < 3:
                 continue
             
-            # 第一行应该是数字序号
-            if not lines[0].isdecimal():
+            # 第一行应该是数字序号（先校验头两行，不合格的块不必逐行 strip）
+            index = lines[0].strip()
+            if not index.isdecimal():
                 continue
             
             # 第二行应该匹配时间轴格式
-            if not cls.TIMESTAMP_PATTERN.match(lines[1]):
+            timestamp = lines[1].strip()
+            if not timestamp_match(timestamp):
                 continue
             
             # 剩余行是字幕文本
-            text = "\n".join(lines[2:])
-            if text.strip():
+            text = "\n".join([line.strip() for line in lines[2:]])
+            if text and not text.isspace():
                 entries.append(SRTEntry(
-                    index=int(lines[0]),
-                    timestamp=lines[1],
+                    index=int(index),
+                    timestamp=timestamp,
                     text=text
                 ))
         
@@ -82,6 +87,9 @@ class SRTParser:
         :param encoding: 文件编码
         :return: 字幕条目列表
         """
+        # UTF-8 文件可能带 BOM：按 utf-8-sig 读取，否则首条序号前残留 \ufeff 会导致第一条被丢弃
+        if encoding.lower().replace("_", "-") in ("utf-8", "utf8"):
+            encoding = "utf-8-sig"
         with open(file_path, "r", encoding=encoding) as f:
             return cls.parse(f.read())
 
@@ -4,6 +4,7 @@
 """
 import re
 import unicodedata
+from typing import Optional
 
 
 class TextHelper:
@@ -29,6 +30,10 @@ class TextHelper:
         ) for c in range(start, end + 1)
     )
 
+    # 全部标点合并为一个集合 / 字符串：判定只需一次查找，首尾剥离可交给 str.strip
+    PUNCTUATION = CJK_PUNCTUATION | LATIN_PUNCTUATION
+    _PUNCTUATION_CHARS = "".join(sorted(PUNCTUATION))
+
     # 平假名范围
     HIRAGANA_START = 0x3040
     HIRAGANA_END = 0x309F
@@ -41,10 +46,18 @@ class TextHelper:
     HANGEUL_START = 0xAC00
     HANGEUL_END = 0xD7AF
 
+    # any_* 检测用的字符类正则（由上面的范围生成），扫描在正则引擎内完成
+    _HIRAGANA_RE = re.compile(f"[\\u{HIRAGANA_START:04X}-\\u{HIRAGANA_END:04X}]")
+    _KATAKANA_RE = re.compile(f"[\\u{KATAKANA_START:04X}-\\u{KATAKANA_END:04X}]")
+    _KANA_RE = re.compile(
+        f"[\\u{HIRAGANA_START:04X}-\\u{HIRAGANA_END:04X}\\u{KATAKANA_START:04X}-\\u{KATAKANA_END:04X}]"
+    )
+    _HANGEUL_RE = re.compile(f"[\\u{HANGEUL_START:04X}-\\u{HANGEUL_END:04X}]")
+
     @classmethod
     def is_punctuation(cls, char: str) -> bool:
         """判断是否为标点符号"""
-        return char in cls.CJK_PUNCTUATION or char in cls.LATIN_PUNCTUATION
+        return char in cls.PUNCTUATION
 
     @classmethod
     def is_hiragana(cls, char: str) -> bool:
@@ -72,22 +85,22 @@ class TextHelper:
     @classmethod
     def any_hiragana(cls, text: str) -> bool:
         """文本中是否包含平假名"""
-        return any(cls.is_hiragana(c) for c in text)
+        return cls._HIRAGANA_RE.search(text) is not None
 
     @classmethod
     def any_katakana(cls, text: str) -> bool:
         """文本中是否包含片假名"""
-        return any(cls.is_katakana(c) for c in text)
+        return cls._KATAKANA_RE.search(text) is not None
 
     @classmethod
     def any_kana(cls, text: str) -> bool:
         """文本中是否包含假名"""
-        return any(cls.is_kana(c) for c in text)
+        return cls._KANA_RE.search(text) is not None
 
     @classmethod
     def any_hangeul(cls, text: str) -> bool:
         """文本中是否包含谚文"""
-        return any(cls.is_hangeul(c) for c in text)
+        return cls._HANGEUL_RE.search(text) is not None
 
     @classmethod
     def jaccard_similarity(cls, a: str, b: str) -> float:
@@ -104,17 +117,30 @@ class TextHelper:
         if not text:
             return text
         
-        chars = list(text.strip())
-        start, end = 0, len(chars) - 1
-        
-        while start <= end and cls.is_punctuation(chars[start]):
-            start += 1
-        while end >= start and cls.is_punctuation(chars[end]):
-            end -= 1
-        
-        return "".join(chars[start:end + 1]) if start <= end else ""
+        # 先去空白，再去首尾标点（之后露出的空白保留，与逐字符剥离一致）
+        return text.strip().strip(cls._PUNCTUATION_CHARS)
+
+    # BMP 字符显示宽度表（首次遇到非 ASCII 文本时生成），按码位下标直接取值
+    _BMP_WIDTHS: Optional[bytes] = None
+
+    @staticmethod
+    def _char_width(char: str) -> int:
+        return 1 if unicodedata.east_asian_width(char) in "NaH" else 2
+
+    @classmethod
+    def _bmp_widths(cls) -> bytes:
+        widths = cls._BMP_WIDTHS
+        if widths is None:
+            widths = bytes(cls._char_width(chr(c)) for c in range(0x10000))
+            TextHelper._BMP_WIDTHS = widths
+        return widths
 
     @classmethod
     def get_display_length(cls, text: str) -> int:
         """计算字符串的显示宽度（全角字符为2，半角为1）"""
-        return sum(1 if unicodedata.east_asian_width(c) in "NaH" else 2 for c in text)
+        # ASCII 字符（含控制字符）的宽度类别均为 N/Na，显示宽度即长度
+        if text.isascii():
+            return len(text)
+        widths = cls._bmp_widths()
+        char_width = cls._char_width
+        return sum(widths[ord(c)] if c <= "\uffff" else char_width(c) for c in text)
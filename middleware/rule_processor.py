@@ -272,6 +272,20 @@ class RuleProcessor:
         self._compiled_patterns: Dict[str, Any] = {}
         self._compiled_python_scripts: Dict[str, Any] = {}
         self._python_script_errors: Dict[str, str] = {}
+        self._precompile_regex_rules()
+
+    def _precompile_regex_rules(self) -> None:
+        """
+        Validate and compile every active regex rule once, at construction.
+
+        The same processor is reused for every block, so process() only ever
+        hits the compiled-pattern cache instead of validating mid-pipeline.
+        """
+        for rule in self.rules:
+            if not isinstance(rule, dict) or not rule.get('active', True):
+                continue
+            if rule.get('type') == 'regex' and rule.get('pattern'):
+                self._validate_and_compile(rule['pattern'])
 
     def _set_python_script_error(self, script: str, error: Optional[str]) -> None:
         if not script:
@@ -608,7 +622,8 @@ class RuleProcessor:
             return text
 
         current_text = text
-        original_line_count = len(text.splitlines())
+        # Only strict mode compares line counts; skip the split otherwise
+        original_line_count = len(text.splitlines()) if strict_line_count else 0
         
         for i, rule in enumerate(self.rules):
             if not rule.get('active', True):
@@ -624,7 +639,7 @@ class RuleProcessor:
                     if pattern:
                         new_text = current_text.replace(pattern, replacement)
                         # Check line count safety in strict mode
-                        if strict_line_count and len(new_text.splitlines()) != original_line_count:
+                        if strict_line_count and new_text != current_text and len(new_text.splitlines()) != original_line_count:
                             logger.warning(f"[RuleProcessor] Skipping 'replace' rule {pattern} because it changes line count in strict mode.")
                         else:
                             current_text = new_text
@@ -634,7 +649,7 @@ class RuleProcessor:
                         compiled = self._validate_and_compile(pattern)
                         if compiled:
                             new_text = compiled.sub(replacement, current_text)
-                            if strict_line_count and len(new_text.splitlines()) != original_line_count:
+                            if strict_line_count and new_text != current_text and len(new_text.splitlines()) != original_line_count:
                                 logger.warning(f"[RuleProcessor] Skipping 'regex' rule {pattern} because it changes line count in strict mode.")
                             else:
                                 current_text = new_text
@@ -505,6 +505,8 @@ def test_main_exits_nonzero_on_critical_error(monkeypatch, tmp_path):
     server_path = tmp_path / "llama-server.exe"
     server_path.write_text("x", encoding="utf-8")
 
+    calls = []
+
     class FakeEngineSingle:
         def __init__(self, *args, **kwargs):
             pass
@@ -512,8 +514,11 @@ def test_main_exits_nonzero_on_critical_error(monkeypatch, tmp_path):
         def start_server(self):
             return None
 
+        def cancel_start(self):
+            calls.append("cancel_start")
+
         def stop_server(self):
-            return None
+            calls.append("stop_server")
 
     class BoomDocument:
         def set_runtime_context(self, **kwargs):
@@ -546,3 +551,5 @@ def test_main_exits_nonzero_on_critical_error(monkeypatch, tmp_path):
         main_mod.main()
 
     assert exc.value.code == 1
+    # 启动线程先被取消并等待结束，之后才清理服务进程
+    assert calls[:2] == ["cancel_start", "stop_server"]
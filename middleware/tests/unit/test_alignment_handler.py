@@ -149,3 +149,15 @@ def test_alignment_handler_save_reconstructed_source_fallback(tmp_path: Path):
 
     lines = out_path.read_text(encoding="utf-8").splitlines()
     assert lines == ["s1", "s2"]
+
+
+@pytest.mark.unit
+def test_alignment_handler_extract_logical_map_strict_and_loose():
+    text = "@id=1@ foo @end=1@\n@id=2@ bar\n@id=3@ baz @end=3@"
+    assert AlignmentHandler._extract_logical_map(text, expected_ids=[1, 3]) == {1: "foo", 3: "baz"}
+    assert AlignmentHandler._extract_logical_map(text, expected_ids=[1, 2, 3]) == {
+        1: "foo",
+        3: "baz",
+        2: "bar",
+    }
+    assert AlignmentHandler.process_result("  plain text \n") == "plain text"
@@ -1,3 +1,4 @@
+import json
 import subprocess
 from pathlib import Path
 
@@ -100,6 +101,29 @@ def test_start_server_large_batch_uses_ctx_cap(monkeypatch, tmp_path):
     assert "-ub" in cmd and "512" in cmd
 
 
+@pytest.mark.unit
+def test_start_server_after_cancel_does_not_spawn(monkeypatch, tmp_path):
+    server_path = tmp_path / "llama-server.exe"
+    model_path = tmp_path / "model.gguf"
+    server_path.write_text("", encoding="utf-8")
+    model_path.write_text("", encoding="utf-8")
+
+    engine = InferenceEngine(server_path=str(server_path), model_path=str(model_path))
+    spawned = []
+    monkeypatch.setattr(subprocess, "Popen", lambda cmd, **kwargs: spawned.append(cmd))
+    monkeypatch.chdir(tmp_path)
+
+    engine.cancel_start()
+    with pytest.raises(RuntimeError, match="cancelled"):
+        engine.start_server()
+    assert spawned == []
+    assert engine.process is None
+
+    # 已在等待就绪的循环同样立即退出
+    with pytest.raises(RuntimeError, match="cancelled"):
+        engine._wait_for_ready(timeout=5)
+
+
 @pytest.mark.unit
 def test_is_valid_models_response_requires_json_payload():
     class ValidResp:
@@ -214,3 +238,118 @@ def test_chat_completion_rejects_non_sse_stream_without_penalty_retry(monkeypatc
     assert out == ""
     assert usage is None
     assert calls["count"] == 1
+
+
+@pytest.mark.unit
+def test_engine_session_pool_covers_all_parallel_slots(tmp_path):
+    engine = InferenceEngine(
+        server_path=str(tmp_path / "llama-server.exe"),
+        model_path=str(tmp_path / "model.gguf"),
+        n_parallel=16,
+    )
+    adapter = engine.session.get_adapter("http://127.0.0.1:8080")
+    assert adapter._pool_maxsize == 16
+
+
+@pytest.mark.unit
+def test_chat_completion_stream_aborts_char_loop(monkeypatch):
+    engine = InferenceEngine(server_path="dummy", model_path="dummy")
+    tokens = ["前置"] + ["x"] * 60
+
+    class LoopStreamResp:
+        headers = {"content-type": "text/event-stream"}
+
+        @staticmethod
+        def raise_for_status():
+            return None
+
+        @staticmethod
+        def iter_lines():
+            for tok in tokens:
+                chunk = {"choices": [{"delta": {"content": tok}}]}
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}".encode("utf-8")
+            yield b"data: [DONE]"
+
+        @staticmethod
+        def close():
+            return None
+
+    monkeypatch.setattr(engine.session, "post", lambda *args, **kwargs: LoopStreamResp())
+    received = []
+
+    out, usage = engine.chat_completion(
+        messages=[{"role": "user", "content": "hi"}],
+        stream=True,
+        stream_callback=received.append,
+        rep_base=1.0,
+        rep_max=1.0,
+        rep_step=0.1,
+    )
+    # 40 个连续相同字符触发单字符循环检测，流在此截断
+    assert out == "前置" + "x" * 40
+    assert len(received) == 41
+    assert usage["fallback"] is True
+
+
+@pytest.mark.unit
+def test_chat_completion_stream_wraps_reasoning_content(monkeypatch):
+    engine = InferenceEngine(server_path="dummy", model_path="dummy")
+    deltas = [{"reasoning_content": "想"}, {"reasoning_content": "一想"}, {"content": "答"}, {"content": "案"}]
+
+    class ReasoningStreamResp:
+        headers = {"content-type": "text/event-stream"}
+
+        @staticmethod
+        def raise_for_status():
+            return None
+
+        @staticmethod
+        def iter_lines():
+            for delta in deltas:
+                chunk = {"choices": [{"delta": delta}]}
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}".encode("utf-8")
+            yield b"data: [DONE]"
+
+    monkeypatch.setattr(engine.session, "post", lambda *args, **kwargs: ReasoningStreamResp())
+
+    out, usage = engine.chat_completion(
+        messages=[{"role": "user", "content": "hi"}],
+        stream=True,
+        rep_base=1.0,
+        rep_max=1.0,
+        rep_step=0.1,
+    )
+    assert out == "<think>想一想</think>\n答案"
+    assert usage["completion_tokens"] == 4
+
+
+@pytest.mark.unit
+def test_chat_completion_stream_ignores_invalid_utf8_bytes(monkeypatch):
+    engine = InferenceEngine(server_path="dummy", model_path="dummy")
+    frames = [
+        b'data: {"choices": [{"delta": {"content": "\xff\xe7\xad\x94"}}]}',
+        'data: {"choices": [{"delta": {"content": "案"}}]}'.encode("utf-8"),
+        b"data: [DONE]",
+    ]
+
+    class BytesStreamResp:
+        headers = {"content-type": "text/event-stream"}
+
+        @staticmethod
+        def raise_for_status():
+            return None
+
+        @staticmethod
+        def iter_lines():
+            yield from frames
+
+    monkeypatch.setattr(engine.session, "post", lambda *args, **kwargs: BytesStreamResp())
+
+    out, _ = engine.chat_completion(
+        messages=[{"role": "user", "content": "hi"}],
+        stream=True,
+        rep_base=1.0,
+        rep_max=1.0,
+        rep_step=0.1,
+    )
+    assert out == "答案"
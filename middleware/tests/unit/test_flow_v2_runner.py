@@ -458,6 +458,24 @@ def test_flow_v2_runner_load_glossary_inline_json(tmp_path):
     assert "foo" in result and "bar" in result
 
 
+@pytest.mark.unit
+def test_flow_v2_processing_load_glossary_file_cached_until_modified(tmp_path):
+    import os
+    from murasaki_flow_v2.utils import processing as v2_processing
+
+    g = tmp_path / "glossary.json"
+    g.write_text(json.dumps([{"src": "猫", "dst": "cat"}]), encoding="utf-8")
+    first = v2_processing.load_glossary(str(g))
+    assert first == {"猫": "cat"}
+    first["犬"] = "dog"  # callers get their own copy
+    assert v2_processing.load_glossary(str(g)) == {"猫": "cat"}
+
+    g.write_text(json.dumps({"猫": "neko", "犬": "inu"}), encoding="utf-8")
+    stat = os.stat(g)
+    os.utime(g, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert v2_processing.load_glossary(str(g)) == {"猫": "neko", "犬": "inu"}
+
+
 # ---------------------------------------------------------------------------
 # _resolve_source_window
 # ---------------------------------------------------------------------------
@@ -108,3 +108,217 @@ def test_hardware_monitor_falls_back_to_generic_for_intel(monkeypatch):
     assert status["vram_total_gb"] == pytest.approx(16.0)
     assert status["gpu_util"] == 0
 
+
+
+@pytest.mark.unit
+def test_hardware_monitor_caches_subprocess_backend_status(monkeypatch):
+    monkeypatch.setattr(monitor_module.sys, "platform", "linux")
+    monkeypatch.setenv(monitor_module.POLL_INTERVAL_ENV, "5")
+    monkeypatch.setattr(monitor_module.HardwareMonitor, "_init_nvidia", lambda self: False)
+
+    def fake_init_amd(self):
+        self.backend = "amd"
+        self.enabled = True
+        self.name = "AMD GPU"
+        return True
+
+    samples = {"count": 0}
+
+    def fake_amd_status(self):
+        samples["count"] += 1
+        return {"name": self.name, "gpu_util": samples["count"]}
+
+    clock = {"now": 100.0}
+    monkeypatch.setattr(monitor_module.HardwareMonitor, "_init_amd", fake_init_amd)
+    monkeypatch.setattr(monitor_module.HardwareMonitor, "_get_amd_status", fake_amd_status)
+    monkeypatch.setattr(monitor_module.time, "monotonic", lambda: clock["now"])
+
+    monitor = monitor_module.HardwareMonitor()
+    first = monitor.get_status()
+    first["kv_cache"] = 0.5  # 调用方合并的指标不能污染缓存
+    clock["now"] += 4.9
+    second = monitor.get_status()
+    assert samples["count"] == 1
+    assert second == {"name": "AMD GPU", "gpu_util": 1}
+
+    clock["now"] += 0.2
+    assert monitor.get_status()["gpu_util"] == 2
+    assert samples["count"] == 2
+
+
+@pytest.mark.unit
+def test_hardware_monitor_does_not_cache_nvidia_status(monkeypatch):
+    monkeypatch.setattr(monitor_module.sys, "platform", "linux")
+
+    def fake_init_nvidia(self):
+        self.backend = "nvidia"
+        self.enabled = True
+        return True
+
+    samples = {"count": 0}
+
+    def fake_nvidia_status(self):
+        samples["count"] += 1
+        return {"gpu_util": samples["count"]}
+
+    monkeypatch.setattr(monitor_module.HardwareMonitor, "_init_nvidia", fake_init_nvidia)
+    monkeypatch.setattr(monitor_module.HardwareMonitor, "_get_nvidia_status", fake_nvidia_status)
+
+    monitor = monitor_module.HardwareMonitor()
+    monitor.get_status()
+    monitor.get_status()
+    assert samples["count"] == 2
+
+
+def _powermetrics_frame(idle_ratio):
+    import plistlib
+
+    return plistlib.dumps({"gpu": {"idle_ratio": idle_ratio}})
+
+
+@pytest.mark.unit
+def test_hardware_monitor_reads_streamed_powermetrics_frames(monkeypatch):
+    import io
+
+    monkeypatch.setattr(monitor_module.sys, "platform", "darwin")
+    monkeypatch.setattr(monitor_module.HardwareMonitor, "_init_macos", lambda self: None)
+    monitor = monitor_module.HardwareMonitor()
+
+    seen = []
+    original = monitor_module.HardwareMonitor._gpu_util_from_plist
+
+    def recording(payload):
+        value = original(payload)
+        seen.append(value)
+        return value
+
+    monkeypatch.setattr(monitor_module.HardwareMonitor, "_gpu_util_from_plist", staticmethod(recording))
+    stream = io.BytesIO(_powermetrics_frame(0.75) + b"\x00" + _powermetrics_frame(0.1))
+    monitor._read_powermetrics(stream)
+
+    assert seen == [25.0, 90.0]
+    # 进程输出结束（退出）后不再报告过期的使用率
+    assert monitor._pm_gpu_util == -1
+    assert monitor._pm_ready.is_set()
+
+
+@pytest.mark.unit
+def test_hardware_monitor_starts_powermetrics_once(monkeypatch):
+    import threading
+
+    monkeypatch.setattr(monitor_module.sys, "platform", "darwin")
+    monkeypatch.setattr(monitor_module.HardwareMonitor, "_init_macos", lambda self: None)
+    calls = {"run": 0, "popen": 0, "wait": [], "closed_while_reading": False}
+    exited = threading.Event()
+    reading = threading.Event()
+
+    class FakeStdout:
+        def __init__(self):
+            self.lines = [_powermetrics_frame(0.5)]
+
+        def readline(self):
+            if self.lines:
+                return self.lines.pop()
+            # 进程运行期间阻塞，退出后读到 EOF
+            reading.set()
+            exited.wait(5)
+            reading.clear()
+            return b""
+
+        def close(self):
+            calls["closed_while_reading"] = reading.is_set()
+
+    class FakeProc:
+        def __init__(self, *args, **kwargs):
+            calls["popen"] += 1
+            self.stdout = FakeStdout()
+
+        def terminate(self):
+            exited.set()
+
+        def wait(self, timeout=None):
+            calls["wait"].append(timeout)
+            return 0
+
+    class Done:
+        returncode = 0
+
+    def fake_run(*args, **kwargs):
+        calls["run"] += 1
+        return Done()
+
+    monkeypatch.setattr(monitor_module.subprocess, "run", fake_run)
+    monkeypatch.setattr(monitor_module.subprocess, "Popen", FakeProc)
+
+    monitor = monitor_module.HardwareMonitor()
+    assert monitor._get_gpu_util_powermetrics() == 50.0
+    assert monitor._get_gpu_util_powermetrics() == 50.0
+    assert calls["run"] == 1 and calls["popen"] == 1
+    reader = monitor._pm_reader
+    monitor.close()
+
+    # 先结束进程并等待退出，读取线程读到 EOF 后才关闭管道
+    assert calls["wait"] and calls["wait"][0] is not None
+    assert not reader.is_alive()
+    assert calls["closed_while_reading"] is False
+    # 关闭后不再重新拉起 powermetrics
+    assert monitor._get_gpu_util_powermetrics() == -1
+    assert calls["run"] == 1 and calls["popen"] == 1
+
+
+@pytest.mark.unit
+def test_hardware_monitor_prefers_amdsmi_bindings(monkeypatch):
+    import types
+
+    monkeypatch.setattr(monitor_module.sys, "platform", "linux")
+    monkeypatch.setattr(monitor_module.HardwareMonitor, "_init_nvidia", lambda self: False)
+    calls = {"shutdown": 0}
+
+    fake = types.ModuleType("amdsmi")
+    fake.amdsmi_init = lambda: None
+    fake.amdsmi_get_processor_handles = lambda: ["h0"]
+    fake.amdsmi_get_gpu_asic_info = lambda h: {"market_name": "Radeon RX 7900 XTX"}
+    fake.amdsmi_get_gpu_vram_usage = lambda h: {"vram_used": 6144, "vram_total": 24576}
+    fake.amdsmi_get_gpu_activity = lambda h: {"gfx_activity": 37}
+    fake.amdsmi_shut_down = lambda: calls.__setitem__("shutdown", calls["shutdown"] + 1)
+    monkeypatch.setitem(sys.modules, "amdsmi", fake)
+
+    def no_subprocess(*args, **kwargs):
+        raise AssertionError("amd-smi CLI should not be used when bindings are available")
+
+    monkeypatch.setattr(monitor_module.subprocess, "run", no_subprocess)
+
+    monitor = monitor_module.HardwareMonitor()
+    assert monitor.backend == "amd"
+    assert monitor.name == "Radeon RX 7900 XTX"
+    status = monitor.get_status()
+    assert status["vram_used_gb"] == 6.0
+    assert status["vram_total_gb"] == 24.0
+    assert status["vram_percent"] == 25.0
+    assert status["gpu_util"] == 37
+    monitor.close()
+    assert calls["shutdown"] == 1
+
+
+@pytest.mark.unit
+def test_hardware_monitor_reads_total_ram_once(monkeypatch):
+    monkeypatch.setattr(monitor_module.sys, "platform", "darwin")
+    monkeypatch.setattr(monitor_module.HardwareMonitor, "_init_macos", lambda self: None)
+    monkeypatch.setattr(monitor_module.HardwareMonitor, "_sysconf_total_ram_gb", staticmethod(lambda: None))
+    calls = {"sysctl": 0}
+
+    class Result:
+        returncode = 0
+        stdout = str(32 * 1024**3) + "\n"
+
+    def fake_run(cmd, **kwargs):
+        assert cmd[:2] == ["sysctl", "-n"]
+        calls["sysctl"] += 1
+        return Result()
+
+    monkeypatch.setattr(monitor_module.subprocess, "run", fake_run)
+
+    monitor = monitor_module.HardwareMonitor()
+    assert monitor._get_macos_total_ram() == pytest.approx(32.0)
+    assert monitor._get_macos_total_ram() == pytest.approx(32.0)
+    assert calls["sysctl"] == 1
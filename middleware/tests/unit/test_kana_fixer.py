@@ -0,0 +1,28 @@
+import pytest
+
+from murasaki_translator.fixer.kana_fixer import KanaFixer
+
+
+@pytest.mark.unit
+def test_kana_fixer_removes_isolated_trailing_kana():
+    assert KanaFixer.fix("他走了の。") == "他走了の。"  # 前一字是汉字，视为日语语境
+    assert KanaFixer.fix("他走了 の。") == "他走了 。"
+    assert KanaFixer.fix("结束 っ") == "结束 "
+    assert KanaFixer.fix("中 の\n下一行") == "中 の\n下一行"  # 换行不是结束标点
+
+
+@pytest.mark.unit
+def test_kana_fixer_keeps_protected_and_japanese_context():
+    assert KanaFixer.fix("「の」") == "「の」"
+    assert KanaFixer.fix("[の]") == "[の]"
+    assert KanaFixer.fix("これはテストです") == "これはテストです"
+    assert KanaFixer.fix("") == ""
+
+
+@pytest.mark.unit
+def test_kana_fixer_recompiles_for_subclass_rules():
+    class OnlySokuon(KanaFixer):
+        KANA_TO_CLEAN = frozenset({"っ"})
+
+    assert OnlySokuon.fix(" の。 っ。") == " の。 。"
+    assert KanaFixer.fix(" の。 っ。") == " 。 。"
@@ -26,3 +26,30 @@ def test_line_aligner_preview():
     aligned_src, aligned_dst = LineAligner.align_for_preview(src, dst, separator="\n\n")
     assert aligned_src == "a\n\nb"
     assert aligned_dst == "x\n\ny"
+
+
+@pytest.mark.unit
+def test_line_aligner_extract_hanzi_covers_all_ranges():
+    text = "漢字かなカナ㐀丽\U00020000abc、"
+    assert LineAligner.extract_hanzi(text) == {"漢", "字", "㐀", "丽", "\U00020000"}
+    assert LineAligner.extract_hanzi("") == set()
+
+
+@pytest.mark.unit
+def test_line_aligner_subclass_ranges_recompile_pattern():
+    class BasicOnlyAligner(LineAligner):
+        CJK_RANGES = [(0x4E00, 0x9FFF)]
+
+    text = "漢字㐀\uF900\U00020000"
+    assert BasicOnlyAligner.extract_hanzi(text) == {"漢", "字"}
+    assert LineAligner.extract_hanzi(text) == {"漢", "字", "㐀", "\uF900", "\U00020000"}
+
+
+@pytest.mark.unit
+def test_line_aligner_proportional_split_is_exact():
+    # 浮点比值 299/273 会让 int(276 / ratio) 落到 251；精确值为 276 * 273 / 299 = 252
+    src = [f"s{i}" for i in range(299)]
+    dst = [f"d{i}" for i in range(273)]
+    aligned = LineAligner.align(src, dst)
+    assert aligned[276] == ("s276", "d252")
+    assert aligned[-1] == ("s298", "d272")
@@ -10,6 +10,14 @@ from murasaki_translator.main import (
     get_missed_terms,
     build_retry_feedback,
     calculate_skip_blocks,
+    block_line_counts,
+    scan_lines,
+    count_nonempty_lines,
+    _nvml_gpu_names,
+    format_model_info,
+    safe_print_json_batch,
+    _start_server_in_background,
+    wait_while_paused,
     _extract_interrupted_preview_text,
     _normalize_anchor_stream,
     _parse_protect_pattern_lines,
@@ -78,6 +86,24 @@ def test_load_existing_output_lines(tmp_path: Path):
     assert content == ["a", "", "b"]
 
 
+@pytest.mark.unit
+def test_load_existing_output_summary_after_large_body(tmp_path: Path):
+    path = tmp_path / "out.txt"
+    body = "译文行\n" * 5000
+    path.write_text(body + "=" * 40 + "\nTranslation Summary\n", encoding="utf-8")
+    assert load_existing_output(str(path)) == (-1, [], False)
+    # summary 不在尾部时仍按全文判断
+    path.write_text("Translation Summary\n" + "=" * 20 + "\n" + body, encoding="utf-8")
+    assert load_existing_output(str(path)) == (-1, [], False)
+
+
+@pytest.mark.unit
+def test_load_existing_output_normalizes_crlf(tmp_path: Path):
+    path = tmp_path / "out.txt"
+    path.write_bytes("a\r\n\r\nb\r\n".encode("utf-8"))
+    assert load_existing_output(str(path)) == (3, ["a", "", "b"], True)
+
+
 @pytest.mark.unit
 def test_get_missed_terms_and_feedback():
     missed = get_missed_terms("foo bar", "foo", {"foo": "FOO", "bar": "BAR"})
@@ -86,6 +112,19 @@ def test_get_missed_terms_and_feedback():
     assert "BAR" in feedback
 
 
+@pytest.mark.unit
+def test_build_retry_feedback_text():
+    assert build_retry_feedback([], 50.0) == ""
+    assert build_retry_feedback([("{a}", "B")], 50.0) == (
+        "\n\n【系统提示】上一轮翻译中以下术语未正确应用：「{a}」→「B」。"
+        "请在本次翻译中严格使用术语表中的标准译法，不要擅自简化或省略。"
+    )
+    many = [(f"s{i}", f"d{i}") for i in range(7)]
+    feedback = build_retry_feedback(many, 10.0)
+    assert "「s4」→「d4」 等 7 项。" in feedback
+    assert "s5" not in feedback
+
+
 @pytest.mark.unit
 def test_calculate_skip_blocks():
     blocks = [
@@ -107,6 +146,26 @@ def test_calculate_skip_blocks_chunk_mode():
     assert skipped == 0
 
 
+@pytest.mark.unit
+def test_calculate_skip_blocks_matches_linear_scan():
+    blocks = [TextBlock(id=i, prompt_text="x\n" * (i % 4)) for i in range(30)]
+    counts = block_line_counts(blocks)
+    assert counts[:4] == [1, 2, 3, 4]
+    for chunk_mode in (False, True):
+        extra = 1 if chunk_mode else 0
+        for existing in range(0, sum(counts) + 2 * len(counts)):
+            expected, total = len(blocks), 0
+            for i, n in enumerate(counts):
+                if total + n + extra > existing:
+                    expected = i
+                    break
+                total += n + extra
+            if existing <= 0:
+                expected = 0
+            assert calculate_skip_blocks(blocks, existing, chunk_mode) == expected
+            assert calculate_skip_blocks(blocks, existing, chunk_mode, line_counts=counts) == expected
+
+
 @pytest.mark.unit
 def test_normalize_anchor_stream():
     text = "＠ｉｄ＝２＠\nhello\n＠ｅｎｄ＝２＠"
@@ -182,3 +241,156 @@ def test_normalize_alignment_mode_for_txt_input():
 )
 def test_extract_interrupted_preview_text(payload, expected):
     assert _extract_interrupted_preview_text(payload) == expected
+
+
+@pytest.mark.unit
+def test_scan_lines_matches_strip_filter():
+    lines = ["abc", "", "  ", "\u3000", " x ", "\t\n", "行"]
+    kept = [l for l in lines if l.strip()]
+    assert scan_lines(lines) == (len(kept), sum(len(l) for l in kept))
+    assert count_nonempty_lines(lines) == len(kept)
+
+
+@pytest.mark.unit
+def test_nvml_gpu_names_reads_all_devices(monkeypatch):
+    import sys
+    import types
+
+    calls = []
+    fake = types.ModuleType("pynvml")
+    fake.nvmlInit = lambda: calls.append("init")
+    fake.nvmlShutdown = lambda: calls.append("shutdown")
+    fake.nvmlDeviceGetCount = lambda: 2
+    fake.nvmlDeviceGetHandleByIndex = lambda i: i
+    fake.nvmlDeviceGetName = lambda h: [b"NVIDIA GeForce RTX 4090", "NVIDIA RTX A4000"][h]
+    monkeypatch.setitem(sys.modules, "pynvml", fake)
+
+    assert _nvml_gpu_names() == ["NVIDIA GeForce RTX 4090", "NVIDIA RTX A4000"]
+    assert calls == ["init", "shutdown"]
+
+
+@pytest.mark.unit
+def test_nvml_gpu_names_empty_when_nvml_unavailable(monkeypatch):
+    import sys
+    import types
+
+    fake = types.ModuleType("pynvml")
+
+    def fail():
+        raise RuntimeError("NVML Shared Library Not Found")
+
+    fake.nvmlInit = fail
+    monkeypatch.setitem(sys.modules, "pynvml", fake)
+    assert _nvml_gpu_names() == []
+
+
+@pytest.mark.unit
+def test_format_model_info_parses_filename_tokens():
+    assert format_model_info("/models/Murasaki-8B-Q4_K_M.gguf") == ("Murasaki-8B-v0.1", "8B", "Q4_K_M")
+    assert format_model_info("qwen-72b-fp16.gguf") == ("qwen-72b-fp16.gguf", "72B", "FP16")
+    # earlier table entries win, matching the original if/elif order
+    assert format_model_info("x-72b-8bit-q8_0.gguf")[1:] == ("8B", "Q8_0")
+    assert format_model_info("tiny.gguf")[1:] == ("Unknown", "Unknown")
+
+
+@pytest.mark.unit
+def test_safe_print_json_batch_single_write(monkeypatch):
+    import io
+    import sys
+
+    class Recorder(io.StringIO):
+        writes = 0
+        flushes = 0
+
+        def write(self, data):
+            Recorder.writes += 1
+            return super().write(data)
+
+        def flush(self):
+            Recorder.flushes += 1
+
+    out = Recorder()
+    monkeypatch.setattr(sys, "stdout", out)
+    safe_print_json_batch("JSON_WARNING", [{"block": 1, "message": "术语"}, {"block": 1, "message": "b"}])
+    safe_print_json_batch("JSON_WARNING", [])
+    assert out.getvalue() == (
+        '\nJSON_WARNING:{"block": 1, "message": "术语"}\n'
+        '\nJSON_WARNING:{"block": 1, "message": "b"}\n'
+    )
+    assert (Recorder.writes, Recorder.flushes) == (1, 1)
+
+
+@pytest.mark.unit
+def test_start_server_in_background_waits_and_reraises():
+    import threading
+
+    started = threading.Event()
+
+    class Engine:
+        def start_server(self):
+            started.set()
+
+    wait, _ = _start_server_in_background(Engine())
+    wait()
+    assert started.is_set()
+
+    class BrokenEngine:
+        def start_server(self):
+            raise FileNotFoundError("Server binary not found")
+
+    wait, _ = _start_server_in_background(BrokenEngine())
+    with pytest.raises(FileNotFoundError):
+        wait()
+
+
+@pytest.mark.unit
+def test_start_server_in_background_cancel_joins_before_cleanup():
+    import threading
+
+    entered = threading.Event()
+
+    class SlowEngine:
+        def __init__(self):
+            self.cancelled = threading.Event()
+            self.spawned = False
+
+        def start_server(self):
+            entered.set()
+            if self.cancelled.wait(5):
+                raise RuntimeError("Server start cancelled")
+            self.spawned = True
+
+        def cancel_start(self):
+            self.cancelled.set()
+
+    engine = SlowEngine()
+    _, cancel = _start_server_in_background(engine)
+    assert entered.wait(2)
+    cancel()
+    # cancel() returns only after the start thread has finished
+    assert engine.cancelled.is_set()
+    assert engine.spawned is False
+
+
+@pytest.mark.unit
+def test_wait_while_paused_returns_after_pause_file_removed(tmp_path: Path):
+    import threading
+
+    pause_file = tmp_path / "out.txt.pause"
+    wait_while_paused(str(pause_file))  # 未暂停时立即返回
+
+    pause_file.write_text("", encoding="utf-8")
+    done = []
+    workers = [
+        threading.Thread(target=lambda: done.append(wait_while_paused(str(pause_file), poll_interval=0.01)))
+        for _ in range(3)
+    ]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(0.1)
+    assert done == []
+    pause_file.unlink()
+    for w in workers:
+        w.join(2)
+    assert len(done) == 3
@@ -22,3 +22,11 @@ def test_model_config_non_murasaki(tmp_path):
     config = model_config.identify_model(str(path))
     assert config is not None
     assert config.display_name == "Foo-7B-Q4_K_M"
+
+
+@pytest.mark.unit
+def test_model_config_detect_quant_type_follows_pattern_priority():
+    # 多个量化标记同时出现时按 QUANT_PATTERNS 顺序取第一个，而不是最靠左的
+    assert model_config.detect_quant_type("Foo-Q4_K_M-IQ2_S.gguf") == "IQ2_S"
+    assert model_config.detect_quant_type("foo_q5-1.gguf") == "Q5_1"
+    assert model_config.detect_quant_type("foo.gguf") == "Unknown"
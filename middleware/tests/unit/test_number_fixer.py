@@ -0,0 +1,24 @@
+import pytest
+
+from murasaki_translator.fixer.number_fixer import NumberFixer
+
+
+@pytest.mark.unit
+def test_number_fixer_restores_all_circled_positions():
+    src = "①と②、それから3と④"
+    dst = "1和2，然后3和4"
+    assert NumberFixer.fix(src, dst) == "①和②，然后3和④"
+
+
+@pytest.mark.unit
+def test_number_fixer_skips_without_circled_source():
+    assert NumberFixer.fix("1と2", "１和２") == "１和２"
+
+
+@pytest.mark.unit
+def test_number_fixer_fix_batch_matches_fix():
+    src_lines = ["①番", "普通", "⑳と㉑"]
+    dst_lines = ["1号", "普通", "20和21 22"]
+    expected = [NumberFixer.fix(s, d) for s, d in zip(src_lines, dst_lines)]
+    assert NumberFixer.fix_batch(src_lines, dst_lines) == expected
+    assert expected[2] == "⑳和㉑ 22"
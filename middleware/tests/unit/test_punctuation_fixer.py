@@ -0,0 +1,38 @@
+import pytest
+
+from murasaki_translator.fixer.punctuation_fixer import PunctuationFixer
+
+
+@pytest.mark.unit
+def test_punctuation_fixer_restores_same_count_symbols():
+    src = "「はい？」「いいえ？」"
+    dst = "“是?”“不是?”"
+    out = PunctuationFixer.fix(src, dst, target_is_cjk=False)
+    assert out == "「是？」「不是？」"
+
+
+@pytest.mark.unit
+def test_punctuation_fixer_force_cjk_quotes_and_tail():
+    src = "「行くぞ」と叫んだ！"
+    dst = "「走吧」他喊道"
+    out = PunctuationFixer.fix(src, dst, target_is_cjk=True)
+    assert out == "“走吧”他喊道！"
+
+
+@pytest.mark.unit
+def test_punctuation_fixer_skips_when_counts_already_match():
+    src = "A：B"
+    dst = "A：B:C"
+    assert PunctuationFixer.fix(src, dst, target_is_cjk=False) == dst
+
+
+@pytest.mark.unit
+def test_punctuation_fixer_fix_batch_matches_fix():
+    pairs = [
+        ("「はい？」", "“是?”"),
+        ("普通の文", "普通的句子"),
+        ("", "空"),
+        ("A：B", "A:B"),
+    ]
+    expected = [PunctuationFixer.fix(s, d, target_is_cjk=True) for s, d in pairs]
+    assert PunctuationFixer.fix_batch(pairs, target_is_cjk=True) == expected
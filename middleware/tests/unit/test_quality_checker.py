@@ -35,3 +35,27 @@ def test_quality_checker_hangeul_residue():
     warnings = qc.check_output(["hello"], ["\uac00"], source_lang="ko")
     types = {w["type"] for w in warnings}
     assert WarningType.HANGEUL_RESIDUE in types
+
+
+@pytest.mark.unit
+def test_quality_checker_glossary_reused_across_blocks():
+    qc = QualityChecker(glossary={"猫": "cat", "犬": "dog", "鳥": "bird"})
+    src = ["猫がいる", "犬と鳥"]
+    first = qc.check_output(src, ["a cat", "a dog"], source_lang="en")
+    second = qc.check_output(src, ["a cat", "a dog"], source_lang="en")
+    assert first == second
+    missed = [w for w in first if w["type"] == WarningType.GLOSSARY_MISSED]
+    assert [(w["line"], "鳥" in w["message"]) for w in missed] == [(2, True)]
+    # 预筛选结果与逐条遍历整个术语表一致
+    assert qc._check_glossary("犬と鳥", "a dog", 2) == missed
+
+
+@pytest.mark.unit
+def test_quality_checker_line_mismatch_ignores_blank_lines():
+    qc = QualityChecker()
+    warnings = qc.check_output(["a", " 　", "b"], ["x", "", "y", "\t"], source_lang="en")
+    assert all(w["type"] != WarningType.LINE_MISMATCH for w in warnings)
+    warnings = qc.check_output(["a", "b"], ["x", " "], source_lang="en")
+    mismatch = [w for w in warnings if w["type"] == WarningType.LINE_MISMATCH]
+    assert mismatch and "原文 2 行, 译文 1 行" in mismatch[0]["message"]
+    assert any(w["type"] == WarningType.EMPTY_OUTPUT and w["line"] == 2 for w in warnings)
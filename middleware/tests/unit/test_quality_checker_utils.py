@@ -3,6 +3,8 @@
 from murasaki_translator.core.quality_checker import (
     format_warnings_for_log,
     count_warnings_by_type,
+    find_relevant_terms,
+    calculate_glossary_coverage,
 )
 
 
@@ -18,3 +20,29 @@ def test_quality_checker_format_and_count():
     counts = count_warnings_by_type(warnings)
     assert counts["kana_residue"] == 2
     assert counts["line_mismatch"] == 1
+
+
+@pytest.mark.unit
+def test_find_relevant_terms_keeps_glossary_order():
+    glossary = {"魔法": "magic", "剣": "sword", "勇者様": "hero", "魔王": "demon lord", "法使": "x"}
+    source = "勇者様は魔法を使う"
+    assert list(find_relevant_terms(source, glossary).items()) == [
+        ("魔法", "magic"),
+        ("勇者様", "hero"),
+    ]
+    assert find_relevant_terms("魔", glossary) == {}
+
+
+@pytest.mark.unit
+def test_calculate_glossary_coverage_reuses_relevant_terms():
+    glossary = {"魔法": "magic", "勇者様": "hero", "魔王": "demon lord"}
+    source = "勇者様は魔法を使う"
+    relevant = find_relevant_terms(source, glossary)
+    for translated in ("the hero uses magic", "the hero casts"):
+        assert calculate_glossary_coverage(
+            source, translated, glossary, relevant_terms=relevant
+        ) == calculate_glossary_coverage(source, translated, glossary)
+    passed, coverage, _, hit, total = calculate_glossary_coverage(
+        source, "the hero casts", glossary, relevant_terms=relevant
+    )
+    assert (passed, coverage, hit, total) == (False, 50.0, 1, 2)
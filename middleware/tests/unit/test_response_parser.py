@@ -61,3 +61,28 @@ def test_response_parser_preserves_empty_lines():
     raw = "a\n\nb"
     lines, cot = parser.parse(raw, expected_count=0)
     assert lines == ["a", "", "b"]
+
+
+@pytest.mark.unit
+def test_response_parser_without_think_tag_strips_orphan_close():
+    parser = ResponseParser()
+    lines, cot = parser.parse("  line1</think>  \n\nline2  ", expected_count=0)
+    assert cot == ""
+    assert lines == ["line1", "", "line2"]
+    assert parser.think_pattern_closed is ResponseParser().think_pattern_closed
+
+
+@pytest.mark.unit
+def test_response_parser_unclosed_and_repeated_think_blocks():
+    parser = ResponseParser()
+    lines, cot = parser.parse("<think>a</think>x\n<think>b</think>y", expected_count=0)
+    assert cot == "<think>a</think>"
+    assert lines == ["x", "y"]
+
+    lines, cot = parser.parse("<think>still thinking\n", expected_count=0)
+    assert cot == "<think>still thinking"
+    assert lines == [""]
+
+    lines, cot = parser.parse("正文 <think>cut", expected_count=0)
+    assert cot == "<think>cut"
+    assert lines == ["正文"]
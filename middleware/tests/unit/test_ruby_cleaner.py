@@ -15,3 +15,42 @@ def test_ruby_cleaner_aggressive():
     text = "\uff5c\u6f22\u5b57\u300a\u304b\u3093\u3058\u300b"
     out = RubyCleaner.clean(text, aggressive=True)
     assert out == "\u6f22\u5b57"
+
+
+@pytest.mark.unit
+def test_ruby_cleaner_keeps_rule_order_for_nested_markup():
+    text = "plain [ch_\\r[漢,かん]] text"
+    assert RubyCleaner.clean(text) == "plain 漢 text"
+    assert RubyCleaner.clean("no ruby here (a/b)") == "no ruby here (a/b)"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "text, aggressive, expected",
+    [
+        ("\\r[漢字,かんじ]です", False, "漢字です"),
+        ("\\rb[,,x]", False, ","),
+        ("[ch_]]", False, "]"),
+        ("[r_かん][ch_漢]", False, "漢"),
+        ("前[ruby text=かんじ]後", False, "前後"),
+        ("｜漢字［かんじ］と", False, "漢字と"),
+        ("｜字《じ》と", False, "字と"),
+        ("｜漢\n字《じ》", False, "｜漢\n字《じ》"),
+        ("|漢字[かんじ]", True, "漢字"),
+        ("漢《かん》字", True, "漢字"),
+    ],
+)
+def test_ruby_cleaner_rule_outputs(text, aggressive, expected):
+    assert RubyCleaner.clean(text, aggressive=aggressive) == expected
+
+
+@pytest.mark.unit
+def test_ruby_cleaner_compiles_rules_per_class_on_first_use():
+    class CustomCleaner(RubyCleaner):
+        CONSERVATIVE_RULES = ((r"\{rb:(.[^}\n]*+)\}", r"\1"),)
+        _CONSERVATIVE_REQUIRED = (("{", "}"),)
+
+    CustomCleaner.precompile()
+    assert "_compiled" in CustomCleaner.__dict__
+    assert CustomCleaner.clean("{RB:漢字}です") == "漢字です"
+    assert RubyCleaner.clean("{RB:漢字}です") == "{RB:漢字}です"
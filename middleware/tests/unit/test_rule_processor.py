@@ -122,3 +122,15 @@ def test_rule_processor_smart_quotes_preserves_fenced_code_block_quotes():
     out = processor.process(text)
     assert '```json\n{"k":"v"}\n```' in out
     assert "「外部内容」" in out
+
+
+@pytest.mark.unit
+def test_rule_processor_precompiles_active_regex_rules():
+    rules = [
+        {"type": "regex", "pattern": r"(\d+)円", "replacement": r"\1 yen", "active": True},
+        {"type": "regex", "pattern": r"unused", "replacement": "", "active": False},
+    ]
+    processor = RuleProcessor(rules)
+    assert list(processor._compiled_patterns) == [r"(\d+)円"]
+    out = processor.process("100円\n200円", strict_line_count=True)
+    assert out == "100 yen\n200 yen"
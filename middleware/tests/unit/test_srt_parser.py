@@ -25,3 +25,13 @@ def test_srt_parser_format_bilingual():
     out = SRTParser.format_bilingual(entries)
     assert "Hello" in out
     assert "你好" in out
+
+
+@pytest.mark.unit
+def test_srt_parser_parse_file_skips_utf8_bom(tmp_path):
+    path = tmp_path / "bom.srt"
+    path.write_bytes("\ufeff1\n00:00:01,000 --> 00:00:02,000\nこんにちは\n".encode("utf-8"))
+    entries = SRTParser.parse_file(str(path))
+    assert len(entries) == 1
+    assert entries[0].index == 1
+    assert entries[0].text == "こんにちは"
@@ -13,3 +13,11 @@ def test_text_helper_kana_and_hangeul():
 def test_text_helper_strip_punctuation():
     assert TextHelper.strip_punctuation("!!abc??") == "abc"
     assert TextHelper.strip_punctuation("\u3002abc\u3002") == "abc"
+
+
+@pytest.mark.unit
+def test_text_helper_display_length():
+    assert TextHelper.get_display_length("") == 0
+    assert TextHelper.get_display_length("abc\t") == 4
+    assert TextHelper.get_display_length("日本ｶﾅ") == 6
+    assert TextHelper.get_display_length("a\U00020000") == 3
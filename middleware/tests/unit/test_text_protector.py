@@ -39,3 +39,34 @@ def test_text_protector_avoids_placeholder_collision():
     assert placeholder != "@P1@"
     restored = protector.restore(protected)
     assert restored == text
+
+
+@pytest.mark.unit
+def test_text_protector_skips_patterns_without_leading_char():
+    from murasaki_translator.core.text_protector import _leading_literal
+
+    assert _leading_literal(r"<[^>]+>") == "<"
+    assert _leading_literal(r"\$\{[^}]+\}") == "$"
+    assert _leading_literal(r"\d+") is None
+    assert _leading_literal(r"a?b") is None
+    assert _leading_literal(r"<a>|\{b\}") is None
+
+    protector = TextProtector()
+    text = "plain {x} text"
+    protected = protector.protect(text)
+    assert list(protector.replacements.values()) == ["{x}"]
+    assert protector.restore(protected) == text
+
+
+@pytest.mark.unit
+def test_text_protector_fuzzy_regex_is_shared_across_instances():
+    from murasaki_translator.core.text_protector import _fuzzy_placeholder_regex
+
+    first = TextProtector(aggressive_cleaning=True)
+    second = TextProtector(aggressive_cleaning=True)
+    assert first.restore(first.protect("<b>x")) == "<b>x"
+    second.protect("<i>y")
+    assert second.restore("＠ P1 @y") == "<i>y"
+    assert _fuzzy_placeholder_regex("@P1@", True) is _fuzzy_placeholder_regex("@P1@", True)
+    assert _fuzzy_placeholder_regex("@P1@", True).pattern.endswith(r"\s*")
+    assert not _fuzzy_placeholder_regex("@P1@", False).pattern.endswith(r"\s*")
@@ -3,6 +3,7 @@ from pathlib import Path
 
 import pytest
 
+from murasaki_translator.core import cache as cache_module
 from murasaki_translator.core.cache import TranslationCache, get_cache_path, load_cache
 
 
@@ -117,3 +118,23 @@ def test_translation_cache_persists_engine_and_chunk_metadata(tmp_path: Path):
     assert data.get("engineMode") == "v2"
     assert data.get("chunkType") == "line"
     assert data.get("pipelineId") == "pipeline_demo"
+
+
+@pytest.mark.unit
+def test_translation_cache_save_falls_back_when_fast_encoder_fails(tmp_path: Path, monkeypatch):
+    class FailingEncoder:
+        OPT_INDENT_2 = 0
+
+        @staticmethod
+        def dumps(data, option=0):
+            raise TypeError("unsupported")
+
+    monkeypatch.setattr(cache_module, "orjson", FailingEncoder)
+    output_path = tmp_path / "out.txt"
+    cache = TranslationCache(str(output_path))
+    cache.add_block(0, "あ", "啊")
+    assert cache.save() is True
+
+    raw = Path(get_cache_path(str(output_path))).read_text(encoding="utf-8")
+    assert '"src": "あ"' in raw
+    assert json.loads(raw)["blocks"][0]["dst"] == "啊"
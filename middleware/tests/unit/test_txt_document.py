@@ -0,0 +1,24 @@
+from pathlib import Path
+
+import pytest
+
+from murasaki_translator.documents.txt import TxtDocument
+from murasaki_translator.core.chunker import TextBlock
+
+
+@pytest.mark.unit
+def test_txt_document_load_and_save(tmp_path: Path):
+    src = tmp_path / "a.txt"
+    src.write_bytes("第一行\r\n\n第三行".encode("utf-8"))
+
+    doc = TxtDocument(str(src))
+    items = doc.load()
+    assert items == [
+        {"text": "第一行\n", "meta": 0},
+        {"text": "\n", "meta": 1},
+        {"text": "第三行", "meta": 2},
+    ]
+
+    out_path = tmp_path / "out.txt"
+    doc.save(str(out_path), [TextBlock(id=1, prompt_text="line 1"), TextBlock(id=2, prompt_text="")])
+    assert out_path.read_text(encoding="utf-8") == "line 1\n"